@@ -1,11 +1,27 @@
-from .command_values import load_command_values, store_command_values
-from .command import *
-from .component import *
-from .curve3d import *
-from .helpers import *
-from .matrix import *
-from .point3d import *
-from .sketch import *
-from .sketch_dimension import *
-from .vector import *
-from .vector3d import *
+try:
+    import adsk.core
+except ModuleNotFoundError:
+    # outside Fusion 360 only the modules
+    # that do not use the API are available
+    from .command_presets import PresetStore, default_preset_store
+    from .fitting import *
+    from .transform import *
+    from .vector import *
+    from .vector_array import *
+else:
+    from .command_values import load_command_values, store_command_values
+    from .command_presets import PresetStore, default_preset_store
+    from .command import *
+    from .component import *
+    from .curve3d import *
+    from .fitting import *
+    from .helpers import *
+    from .matrix import *
+    from .point3d import *
+    from .profiler import *
+    from .sketch import *
+    from .sketch_dimension import *
+    from .transform import *
+    from .vector import *
+    from .vector_array import *
+    from .vector3d import *
@@ -0,0 +1,34 @@
+"""Shared setup of the benchmark scripts.
+
+The scripts run outside Fusion 360. `load_package` imports this repository
+as a package, with the stub `adsk` module of `stubs/` when asked for it.
+"""
+
+from __future__ import annotations
+import importlib
+import os
+import sys
+import time
+from collections.abc import Callable
+from typing import Any
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+
+
+def load_package(stub_adsk: bool = False):
+    if stub_adsk:
+        sys.path.insert(0, os.path.join(HERE, "stubs"))
+    sys.path.insert(0, os.path.dirname(ROOT))
+    return importlib.import_module(os.path.basename(ROOT))
+
+
+def best_time(fn: Callable[[], Any], repeat: int = 3) -> tuple[float, Any]:
+    """Shortest of repeat runs of fn in seconds, and its last result."""
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
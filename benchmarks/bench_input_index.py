@@ -0,0 +1,156 @@
+"""Reads of command inputs by key lookups and by CommandInputIndex.
+
+Fake inputs make up tabs of nested groups and count every attribute read
+and itemById call, each of which is an API call in Fusion 360. Runs with
+the stub `adsk` of `stubs/`, which command_values imports.
+
+    python benchmarks/bench_input_index.py [tabs] [depth] [leaves]
+"""
+
+from __future__ import annotations
+import sys
+from collections import Counter
+
+from _common import best_time, load_package
+
+pkg = load_package(stub_adsk=True)
+values_module = pkg.command_values
+
+reads: Counter[str] = Counter()
+
+
+class FakeInputs:
+    """CommandInputs of the fakes."""
+
+    def __init__(self):
+        self.items: list[FakeInput] = []
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def itemById(self, id: str):
+        reads["itemById"] += 1
+        return next((item for item in self.items if item._id == id), None)
+
+    def add(self, item: FakeInput):
+        item._parent = self
+        self.items.append(item)
+        return item
+
+
+class FakeInput:
+    object_type = "adsk::core::ValueCommandInput"
+
+    def __init__(self, id: str, value: float = 1.0):
+        self._id = id
+        self._value = value
+        self._parent: FakeInputs | None = None
+
+    @property
+    def id(self):
+        reads["id"] += 1
+        return self._id
+
+    @property
+    def objectType(self):
+        reads["objectType"] += 1
+        return self.object_type
+
+    @property
+    def commandInputs(self):
+        reads["commandInputs"] += 1
+        return self._parent
+
+    @property
+    def value(self):
+        reads["value"] += 1
+        return self._value
+
+    @value.setter
+    def value(self, value: float):
+        reads["value="] += 1
+        self._value = value
+
+
+class FakeGroup(FakeInput):
+    object_type = "adsk::core::GroupCommandInput"
+
+    def __init__(self, id: str):
+        super().__init__(id)
+        self._children = FakeInputs()
+        self.isExpanded = True
+
+    @property
+    def children(self):
+        reads["children"] += 1
+        return self._children
+
+
+class FakeTab(FakeGroup):
+    object_type = "adsk::core::TabCommandInput"
+    isActive = True
+
+    def activate(self):
+        reads["activate"] += 1
+
+
+def build(tabs: int, depth: int, leaves: int) -> FakeInputs:
+    """tabs of groups nested depth deep, with leaves values at each level."""
+    root = FakeInputs()
+    for t in range(tabs):
+        inputs = root.add(FakeTab(f"tab{t}")).children
+        for d in range(depth):
+            for i in range(leaves):
+                inputs.add(FakeInput(f"v{d}_{i}", float(i)))
+            inputs = inputs.add(FakeGroup(f"group{d}"))._children
+    return root
+
+
+def measure(name: str, fn):
+    reads.clear()
+    fn()
+    count = sum(reads.values())
+    t, _ = best_time(fn)
+    print(f"  {name:<46}{count:8} reads{t * 1000:9.2f} ms")
+
+
+def main():
+    args = [int(a) for a in sys.argv[1:]]
+    tabs, depth, leaves = args + [4, 6, 5][len(args) :]
+    root = build(tabs, depth, leaves)
+    keys = values_module.get_command_values(root)
+    print(f"{tabs} tabs, groups {depth} deep, {len(keys)} inputs")
+
+    def load_by_keys():
+        values = values_module.get_command_values(root)
+        for key, value in values.items():
+            values_module.set_command_value(root, key, value)
+
+    def load_by_index():
+        index = values_module.CommandInputIndex(root)
+        for key, value in index.values().items():
+            index.set_value(key, value)
+
+    print("load: read all values and set each back")
+    measure("get_command_values + set_command_value", load_by_keys)
+    measure("CommandInputIndex", load_by_index)
+
+    index = values_module.CommandInputIndex(root)
+    tab = root.items[0]
+
+    def preview_twice():
+        index.values()
+        values_module.get_command_values(tab.children)
+
+    def preview_once():
+        values = index.values()
+        prefix = tab._id + "."
+        return {k[len(prefix) :]: v for k, v in values.items() if k.startswith(prefix)}
+
+    print("preview of a TabbedCommand with stages, index already built")
+    measure("index.values() + get_command_values(tab)", preview_twice)
+    measure("index.values(), tab values filtered by prefix", preview_once)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""API objects created per sketch, and bulk Point3D conversion.
+
+Runs with the stub `adsk` of `stubs/`, which counts the API calls. Both
+`Point3D.create` and `Point3D.set` are counted as API calls.
+
+    python benchmarks/bench_point3d.py [rectangles] [points]
+"""
+
+from __future__ import annotations
+import sys
+
+from _common import best_time, load_package
+
+pkg = load_package(stub_adsk=True)
+import adsk.core, adsk.fusion  # noqa: E402  (the stub, put on the path above)
+
+Vector = pkg.Vector
+calls = adsk.core.calls
+
+
+def point3d_calls() -> tuple[int, int]:
+    return calls["Point3D.create"], calls["Point3D.set"]
+
+
+def count(name: str, n: int, build):
+    calls.clear()
+    build()
+    created, set_ = point3d_calls()
+    print(
+        f"  {name:<34}{created / n:8.1f} create{set_ / n:8.1f} set"
+        f"{(created + set_) / n:8.1f} calls"
+    )
+
+
+def main():
+    rectangles = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    points = int(sys.argv[2]) if len(sys.argv) > 2 else 10_000
+
+    print(f"Point3D API calls per rectangle, {rectangles} rectangles")
+    count(
+        "sketch_rectangle",
+        rectangles,
+        lambda: [
+            pkg.sketch_rectangle(
+                adsk.fusion.Sketch(), Vector(i, 0), Vector(i + 0.8, 0.5), fillet=0.1
+            )
+            for i in range(rectangles)
+        ],
+    )
+    columns = 10
+    count(
+        "sketch_rectangle_array",
+        rectangles,
+        lambda: pkg.sketch_rectangle_array(
+            adsk.fusion.Sketch(),
+            Vector(0, 0),
+            Vector(0.8, 0.5),
+            columns,
+            rectangles // columns,
+            Vector(1, 1),
+            fillet=0.1,
+        ),
+    )
+    count(
+        "sketch_rectangle_polar_array",
+        rectangles,
+        lambda: pkg.sketch_rectangle_polar_array(
+            adsk.fusion.Sketch(), Vector(5, 0), Vector(5.8, 0.5), rectangles, fillet=0.1
+        ),
+    )
+
+    vectors = [Vector(i, i * 0.5, 0) for i in range(points)]
+    array = pkg.VectorArray.from_vectors(vectors)
+    print(f"conversion of {points} points")
+    for name, convert in (
+        ("[point3d(v) for v in vectors]", lambda: [pkg.point3d(v) for v in vectors]),
+        ("point3d_list(vectors)", lambda: pkg.point3d_list(vectors)),
+        ("point3d_list(VectorArray)", lambda: pkg.point3d_list(array)),
+    ):
+        t, _ = best_time(convert)
+        print(f"  {name:<34}{t * 1000:8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
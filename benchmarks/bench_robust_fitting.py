@@ -0,0 +1,153 @@
+"""RANSAC / LMedS fitting against repeated naive refits on noisy clouds.
+
+Each cloud has Gaussian noise on the model and a share of uniform outliers.
+The naive baseline is what we did by hand: least-squares fit with the
+`vector.py` fitters, drop the points farther than 2 rms, and fit again.
+
+    python benchmarks/bench_robust_fitting.py [points] [outlier_ratio]
+"""
+
+from __future__ import annotations
+import math
+import random
+import sys
+
+from _common import best_time, load_package
+
+pkg = load_package()
+Vector = pkg.Vector
+VectorArray = pkg.VectorArray
+
+NOISE = 1e-3
+REFITS = 7
+
+
+def angle_error(a, b) -> float:
+    """Angle between two unsigned directions in degrees."""
+    cos = abs(a.dot(b)) / (abs(a) * abs(b))
+    return math.degrees(math.acos(min(1.0, cos)))
+
+
+def with_outliers(rng: random.Random, inliers: list, n: int, ratio: float):
+    outliers = [
+        Vector(rng.uniform(-1, 1), rng.uniform(-1, 1), rng.uniform(-1, 1))
+        for _ in range(int(n * ratio))
+    ]
+    points = inliers[: n - len(outliers)] + outliers
+    rng.shuffle(points)
+    return points
+
+
+def plane_cloud(rng: random.Random, n: int, ratio: float):
+    normal = Vector(0.1, 0.2, 1).normalize()
+    inliers = []
+    for _ in range(n):
+        x, y = rng.uniform(-1, 1), rng.uniform(-1, 1)
+        z = -(normal.x * x + normal.y * y) / normal.z
+        inliers.append(Vector(x, y, z) + normal * rng.gauss(0, NOISE))
+    return with_outliers(rng, inliers, n, ratio), normal
+
+
+def line_cloud(rng: random.Random, n: int, ratio: float):
+    direction = Vector(1, 0.5, 0.25).normalize()
+    inliers = [
+        direction * rng.uniform(-1, 1)
+        + Vector(rng.gauss(0, NOISE), rng.gauss(0, NOISE), rng.gauss(0, NOISE))
+        for _ in range(n)
+    ]
+    return with_outliers(rng, inliers, n, ratio), direction
+
+
+def circle_cloud(rng: random.Random, n: int, ratio: float):
+    inliers = []
+    for _ in range(n):
+        t = rng.uniform(0, 2 * math.pi)
+        r = 0.5 + rng.gauss(0, NOISE)
+        inliers.append(Vector(r * math.cos(t), r * math.sin(t), rng.gauss(0, NOISE)))
+    return with_outliers(rng, inliers, n, ratio), 0.5
+
+
+def naive_refit(points: list, fit, distance):
+    """Fit, drop points beyond 2 rms and fit again, REFITS times."""
+    model = None
+    for _ in range(REFITS):
+        model = fit(points)
+        d = [distance(p, model) for p in points]
+        rms = math.sqrt(sum(e * e for e in d) / len(d))
+        points = [p for p, e in zip(points, d) if e <= 2 * rms]
+    return model
+
+
+def plane_distance(p, model):
+    normal, centroid = model
+    return abs((p - centroid).dot(normal))
+
+
+def line_distance(p, model):
+    point, direction = model
+    return abs((p - point).cross(direction))
+
+
+def circle_distance(p, model):
+    center, normal, radius = model
+    d = p - center
+    h = d.dot(normal)
+    return math.hypot(h, abs(d - normal * h) - radius)
+
+
+def report(name: str, n: int, seconds: float, error: str):
+    rate = n / seconds / 1e6
+    print(f"  {name:<28}{seconds * 1000:9.1f} ms{rate:8.2f} Mpt/s  {error}")
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    ratio = float(sys.argv[2]) if len(sys.argv) > 2 else 0.3
+    backend = "NumPy" if pkg.vector_array.np is not None else "pure Python"
+    print(f"{n} points, {ratio:.0%} outliers, {backend} backend")
+    rng = random.Random(1)
+
+    points, normal = plane_cloud(rng, n, ratio)
+    array = VectorArray.from_vectors(points)
+    print("plane (error of the normal)")
+    for method, threshold in (("ransac", 5 * NOISE), ("lmeds", None)):
+        t, (model, _) = best_time(
+            lambda: pkg.robust_fit3d_by_plane(array, threshold, method, seed=0)
+        )
+        report(method, n, t, f"{angle_error(model[0], normal):.4f} deg")
+    t, model = best_time(lambda: pkg.vector.fit3d_by_plane(points), 1)
+    report("fit3d_by_plane once", n, t, f"{angle_error(model[0], normal):.4f} deg")
+    t, model = best_time(
+        lambda: naive_refit(points, pkg.vector.fit3d_by_plane, plane_distance), 1
+    )
+    error = angle_error(model[0], normal)
+    report(f"naive refit x{REFITS}", n, t, f"{error:.4f} deg")
+
+    points, direction = line_cloud(rng, n, ratio)
+    array = VectorArray.from_vectors(points)
+    print("line (error of the direction)")
+    t, (model, _) = best_time(
+        lambda: pkg.robust_fit3d_by_line(array, 5 * NOISE, seed=0)
+    )
+    report("ransac", n, t, f"{angle_error(model[1], direction):.4f} deg")
+    t, model = best_time(
+        lambda: naive_refit(points, pkg.vector.fit3d_by_line, line_distance), 1
+    )
+    error = angle_error(model[1], direction)
+    report(f"naive refit x{REFITS}", n, t, f"{error:.4f} deg")
+
+    points, radius = circle_cloud(rng, n, ratio)
+    array = VectorArray.from_vectors(points)
+    print("circle (error of the radius)")
+    t, (model, _) = best_time(
+        lambda: pkg.robust_fit3d_by_circle(array, 5 * NOISE, seed=0)
+    )
+    report("ransac", n, t, f"{abs(model[2] - radius):.2e}")
+    t, model = best_time(
+        lambda: naive_refit(points, pkg.fit3d_by_circle, circle_distance), 1
+    )
+    report(f"naive refit x{REFITS}", n, t, f"{abs(model[2] - radius):.2e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""Solver work of a rectangle panel drawn directly and with SketchBatch.
+
+Runs with the stub `adsk` of `stubs/`, whose sketch counts a solve for
+every entity, constraint or dimension added while the compute is not
+deferred, and one when the deferral is turned off. "switches" counts the
+changes between adding geometry and adding constraints or dimensions.
+
+    python benchmarks/bench_sketch_batch.py [rectangles]
+"""
+
+from __future__ import annotations
+import sys
+import time
+
+from _common import load_package
+
+pkg = load_package(stub_adsk=True)
+import adsk.core, adsk.fusion  # noqa: E402  (the stub, put on the path above)
+
+Vector = pkg.Vector
+calls = adsk.core.calls
+COLUMNS = 20
+
+
+def corners(i: int):
+    x, y = i % COLUMNS, i // COLUMNS
+    return Vector(x, y), Vector(x + 0.8, y + 0.5)
+
+
+def direct(sketch, n: int, fillet: float | None):
+    for i in range(n):
+        pkg.sketch_rectangle(sketch, *corners(i), fillet=fillet)
+
+
+def batched(sketch, n: int, fillet: float | None):
+    with pkg.SketchBatch(sketch) as batch:
+        for i in range(n):
+            batch.rectangle(*corners(i), fillet=fillet)
+
+
+def switches(history: list[str]) -> int:
+    kinds = [
+        name.split(".")[0] in ("GeometricConstraints", "SketchDimensions")
+        for name in history
+    ]
+    return sum(a != b for a, b in zip(kinds, kinds[1:]))
+
+
+def dimensioned_points(sketch) -> list:
+    return [
+        [tuple(e.geometry.asArray()) for e in d.entities[:2]]
+        for d in sketch.sketchDimensions
+        if d.kind == "DistanceDimension"
+    ]
+
+
+def run(build, n: int, fillet: float | None):
+    calls.clear()
+    sketch = adsk.fusion.Sketch()
+    start = time.perf_counter()
+    build(sketch, n, fillet)
+    seconds = time.perf_counter() - start
+    return sketch, calls["solve"], switches(sketch.history), seconds
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    print(f"{n} rectangles")
+    for fillet in (None, 0.1):
+        print("with fillets" if fillet else "without fillets")
+        sketches = []
+        for name, build in (
+            ("sketch_rectangle", direct),
+            ("SketchBatch.rectangle", batched),
+        ):
+            sketch, solves, changes, seconds = run(build, n, fillet)
+            sketches.append(sketch)
+            entities = len(sketch.history)
+            print(
+                f"  {name:<24}{solves:6} solves{changes:6} switches"
+                f"{seconds / entities * 1e6:8.1f} us/entity (stub)"
+            )
+        same = dimensioned_points(sketches[0]) == dimensioned_points(sketches[1])
+        print(f"  same dimensioned points: {same}")
+
+
+if __name__ == "__main__":
+    main()
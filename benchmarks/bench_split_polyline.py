@@ -0,0 +1,91 @@
+"""split_polyline on polylines of lines and arcs, with the deviation check.
+
+Every emitted segment is checked independently (an orthogonal line fit of
+its points for lines, the distance from the returned circle for arcs), and
+its largest deviation must stay within the tolerance. The first cases are
+a straight line followed by an arc with noise, whose junction used to get
+arcs off the tolerance.
+
+    python benchmarks/bench_split_polyline.py [pairs] [tolerance]
+"""
+
+from __future__ import annotations
+import math
+import random
+import sys
+
+from _common import best_time, load_package
+
+pkg = load_package()
+Vector = pkg.Vector
+
+
+def line_then_arc(seed: int, noise: float):
+    """20 points of a straight line followed by a tangent radius-1 arc, with
+    Gaussian noise."""
+    rng = random.Random(seed)
+    points = [(i * 0.2, 0.0) for i in range(20)]
+    x0 = points[-1][0]
+    for i in range(1, 100):
+        t = i * 0.03
+        points.append((x0 + math.sin(t), 1 - math.cos(t)))
+    return [Vector(x + rng.gauss(0, noise), y + rng.gauss(0, noise)) for x, y in points]
+
+
+def lines_and_half_circles(pairs: int, points_per_part: int = 50):
+    """pairs of a straight line and a half circle, 2 * pairs * points_per_part
+    points in total."""
+    points = []
+    x = 0.0
+    for _ in range(pairs):
+        for i in range(points_per_part):
+            points.append(Vector(x + i * 0.02, 0))
+        x += points_per_part * 0.02
+        for i in range(points_per_part):
+            t = math.pi * i / points_per_part
+            points.append(Vector(x + 0.5 - 0.5 * math.cos(t), 0.5 * math.sin(t)))
+        x += 1.0 + 0.02
+    return points
+
+
+def max_deviation(points: list, segment) -> float:
+    run = points[segment.start : segment.end + 1]
+    if segment.kind == "arc":
+        return max(abs(abs(p - segment.center) - segment.radius) for p in run)
+    # orthogonal least-squares line through the centroid
+    n = len(run)
+    mx = sum(p.x for p in run) / n
+    my = sum(p.y for p in run) / n
+    sxx = sum((p.x - mx) ** 2 for p in run)
+    sxy = sum((p.x - mx) * (p.y - my) for p in run)
+    syy = sum((p.y - my) ** 2 for p in run)
+    t = 0.5 * math.atan2(2 * sxy, sxx - syy)
+    return max(abs((p.x - mx) * math.sin(t) - (p.y - my) * math.cos(t)) for p in run)
+
+
+def check(name: str, points: list, tolerance: float):
+    t, segments = best_time(lambda: pkg.split_polyline(points, tolerance))
+    deviation = max(max_deviation(points, s) for s in segments)
+    arcs = sum(s.kind == "arc" for s in segments)
+    print(
+        f"  {name:<34}{len(points):7} points{arcs:5} arcs"
+        f"{len(segments) - arcs:5} lines{t * 1000:9.1f} ms"
+        f"  max deviation {deviation:.2e}"
+    )
+    assert deviation <= tolerance, f"{name}: {deviation} > {tolerance}"
+    assert segments[0].start == 0 and segments[-1].end == len(points) - 1
+    assert all(a.end == b.start for a, b in zip(segments, segments[1:]))
+
+
+def main():
+    pairs = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    tolerance = float(sys.argv[2]) if len(sys.argv) > 2 else 1e-3
+    print(f"tolerance {tolerance:g}")
+    for seed in range(5):
+        points = line_then_arc(seed, 0.3 * tolerance)
+        check(f"line + radius-1 arc, seed {seed}", points, tolerance)
+    check(f"{pairs} line + half-circle pairs", lines_and_half_circles(pairs), tolerance)
+
+
+if __name__ == "__main__":
+    main()
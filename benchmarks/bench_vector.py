@@ -0,0 +1,109 @@
+"""Vector construction, arithmetic and rotation, before and after __slots__.
+
+The "before" Vector is vector.py of a git revision, by default the one
+before Vector got __slots__ and the `_vector` constructor. The "after"
+Vector is the one of the working tree, or of a second revision. Old
+revisions import adsk.core, so they run with the stub `adsk` of `stubs/`.
+Times are the best of 7 interleaved timeit runs; bytes per instance are
+measured by tracemalloc.
+
+    python benchmarks/bench_vector.py [before] [after] [number]
+"""
+
+from __future__ import annotations
+import os
+import subprocess
+import sys
+import timeit
+import tracemalloc
+import types
+
+from _common import HERE, ROOT, load_package
+
+pkg = load_package()
+
+BEFORE = "022314f~1"
+INSTANCES = 100_000
+
+
+def load_vector_module(revision: str, name: str) -> types.ModuleType:
+    source = subprocess.run(
+        ["git", "show", f"{revision}:vector.py"],
+        cwd=ROOT,
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    sys.path.insert(0, os.path.join(HERE, "stubs"))
+    module = types.ModuleType(name)
+    sys.modules[module.__name__] = module
+    exec(compile(source, f"{revision}:vector.py", "exec"), module.__dict__)
+    return module
+
+
+CASES = [
+    ("Vector(x, y, z)", "Vector(1.0, 2.0, 3.0)"),
+    ("a + b", "a + b"),
+    ("a * 2.0", "a * 2.0"),
+    ("rotate", "a.rotate(0.3)"),
+    ("rotate(origin)", "a.rotate(0.3, origin)"),
+    ("normalize", "a.normalize()"),
+    ("rotate_axis", "a.rotate_axis(axis, 0.3)"),
+]
+
+
+def timer(Vector, stmt: str) -> timeit.Timer:
+    names = {
+        "Vector": Vector,
+        "a": Vector(1.0, 2.0, 3.0),
+        "b": Vector(0.5, -1.0, 2.0),
+        "origin": Vector(1.0, 1.0, 0.0),
+        "axis": Vector(1.0, 1.0, 1.0),
+    }
+    return timeit.Timer(stmt, globals=names)
+
+
+def nanoseconds(timers: list[timeit.Timer], number: int) -> list[float]:
+    """Best of 7 runs of each timer, the runs of the timers interleaved."""
+    best = [float("inf")] * len(timers)
+    for _ in range(7):
+        for i, t in enumerate(timers):
+            best[i] = min(best[i], t.timeit(number))
+    return [b / number * 1e9 for b in best]
+
+
+def bytes_per_instance(Vector) -> float:
+    tracemalloc.start()
+    start = tracemalloc.get_traced_memory()[0]
+    # the same float objects for all, so that only the vectors are counted
+    x = 1.5
+    vectors = [Vector(x, 0.0, 0.0) for _ in range(INSTANCES)]
+    size = tracemalloc.get_traced_memory()[0] - start
+    tracemalloc.stop()
+    del vectors
+    # the list holding the vectors is not part of them
+    return (size - sys.getsizeof([None] * INSTANCES)) / INSTANCES
+
+
+def main():
+    revision = sys.argv[1] if len(sys.argv) > 1 else BEFORE
+    after_revision = sys.argv[2] if len(sys.argv) > 2 else None
+    number = int(sys.argv[3]) if len(sys.argv) > 3 else 200_000
+    before = load_vector_module(revision, "vector_before").Vector
+    if after_revision is None:
+        after = pkg.Vector
+    else:
+        after = load_vector_module(after_revision, "vector_after").Vector
+    version = ".".join(map(str, sys.version_info[:2]))
+    target = after_revision or "working tree"
+    print(f"best of 7 x {number}, CPython {version}, {revision} -> {target}")
+    for name, stmt in CASES:
+        t0, t1 = nanoseconds([timer(before, stmt), timer(after, stmt)], number)
+        print(f"  {name:<16}{t0:6.0f} ns -> {t1:4.0f} ns")
+    b0 = bytes_per_instance(before)
+    b1 = bytes_per_instance(after)
+    print(f"  {'bytes/instance':<16}{b0:6.0f} B  -> {b1:4.0f} B  ({INSTANCES} vectors)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,20 @@
+"""Stub of the Fusion 360 API for the benchmark scripts.
+
+Only what the benchmarks touch is modelled. `core.calls` counts the API
+calls by name, e.g. "Point3D.create" or "solve". Any other name is a
+placeholder class, so the package modules can be imported.
+"""
+
+from . import core, fusion
+
+
+def autoTerminate(value: bool):
+    pass
+
+
+def terminate():
+    pass
+
+
+def doEvents():
+    pass
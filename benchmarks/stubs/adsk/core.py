@@ -0,0 +1,109 @@
+"""Stub of adsk.core; see the package docstring."""
+
+from __future__ import annotations
+import math
+from collections import Counter
+
+# API calls by name
+calls: Counter[str] = Counter()
+
+
+class _Any:
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def __getattr__(self, name: str):
+        return _Any()
+
+    def __call__(self, *args, **kwargs):
+        return _Any()
+
+
+class _Placeholder(type):
+    # enum members and the like, e.g. MessageBoxButtonTypes.OKButtonType
+    def __getattr__(cls, name: str):
+        return _Any()
+
+
+def __getattr__(name: str):
+    if name.startswith("__"):
+        raise AttributeError(name)
+    cls = _Placeholder(name, (_Any,), {})
+    globals()[name] = cls
+    return cls
+
+
+class Base:
+    pass
+
+
+class _Coordinates(Base):
+    __slots__ = ("x", "y", "z")
+
+    def __init__(self, x: float = 0.0, y: float = 0.0, z: float = 0.0):
+        self.x, self.y, self.z = x, y, z
+
+    @classmethod
+    def create(cls, x: float = 0.0, y: float = 0.0, z: float = 0.0):
+        calls[cls.__name__ + ".create"] += 1
+        return cls(x, y, z)
+
+    def set(self, x: float, y: float, z: float = 0.0):
+        calls[type(self).__name__ + ".set"] += 1
+        self.x, self.y, self.z = x, y, z
+        return True
+
+    def copy(self):
+        calls[type(self).__name__ + ".copy"] += 1
+        return type(self)(self.x, self.y, self.z)
+
+    def asArray(self):
+        return [self.x, self.y, self.z]
+
+    def isEqualToByTolerance(self, other, tolerance: float) -> bool:
+        calls[type(self).__name__ + ".isEqualToByTolerance"] += 1
+        return math.dist(self.asArray(), other.asArray()) <= tolerance
+
+
+class Point3D(_Coordinates):
+    __slots__ = ()
+
+
+class Vector3D(_Coordinates):
+    __slots__ = ()
+
+
+class Point2D(_Coordinates):
+    __slots__ = ()
+
+
+class ObjectCollection(Base):
+    def __init__(self):
+        self.items: list = []
+
+    @classmethod
+    def create(cls):
+        calls["ObjectCollection.create"] += 1
+        return cls()
+
+    @classmethod
+    def createWithArray(cls, items: list):
+        calls["ObjectCollection.createWithArray"] += 1
+        collection = cls()
+        collection.items = list(items)
+        return collection
+
+    def add(self, item):
+        calls["ObjectCollection.add"] += 1
+        self.items.append(item)
+        return True
+
+    @property
+    def count(self):
+        return len(self.items)
+
+    def item(self, index: int):
+        return self.items[index]
+
+    def __iter__(self):
+        return iter(self.items)
@@ -0,0 +1,246 @@
+"""Stub of adsk.fusion with a sketch that counts solves.
+
+Every entity, constraint or dimension added while the compute is not
+deferred costs one "solve" in `core.calls`; with the compute deferred the
+sketch is solved once when the deferral is turned off. A fillet trims its
+lines: their corner end points are replaced by the fillet's tangent points.
+"""
+
+from __future__ import annotations
+import math
+
+from .core import Base, Point3D, _Any, _Placeholder, calls
+
+
+def __getattr__(name: str):
+    if name.startswith("__"):
+        raise AttributeError(name)
+    cls = _Placeholder(name, (_Any,), {})
+    globals()[name] = cls
+    return cls
+
+
+class SketchEntity(Base):
+    def __init__(self, sketch: Sketch):
+        self.sketch = sketch
+        self._fixed = False
+
+    @property
+    def isFixed(self):
+        return self._fixed
+
+    @isFixed.setter
+    def isFixed(self, value: bool):
+        self._fixed = value
+        self.sketch._changed("isFixed")
+
+
+class SketchPoint(SketchEntity):
+    def __init__(self, sketch: Sketch, geometry: Point3D):
+        super().__init__(sketch)
+        self.geometry = Point3D(geometry.x, geometry.y, geometry.z)
+
+
+class SketchCurve(SketchEntity):
+    isConstruction = False
+
+
+class SketchLine(SketchCurve):
+    def __init__(self, sketch: Sketch, start: SketchPoint, end: SketchPoint):
+        super().__init__(sketch)
+        self.startSketchPoint = start
+        self.endSketchPoint = end
+
+
+class SketchArc(SketchLine):
+    def __init__(self, sketch: Sketch, start, end, radius: float):
+        super().__init__(sketch, start, end)
+        self.radius = radius
+
+
+class SketchFittedSpline(SketchLine):
+    def __init__(self, sketch: Sketch, points: list[SketchPoint]):
+        super().__init__(sketch, points[0], points[-1])
+        self.fitPoints = points
+
+
+class SketchDimension(Base):
+    _count = 0
+
+    def __init__(self, kind: str, entities: tuple):
+        SketchDimension._count += 1
+        self.kind = kind
+        self.entities = entities
+        self.parameter = _Parameter(f"d{SketchDimension._count}")
+
+
+class _Parameter:
+    def __init__(self, name: str):
+        self.name = name
+        self.expression = ""
+
+
+class _Constraint(Base):
+    def __init__(self, kind: str, entities: tuple):
+        self.kind = kind
+        self.entities = entities
+
+
+class _Collection:
+    def __init__(self, sketch: Sketch):
+        self.sketch = sketch
+        self.items: list = []
+
+    def _added(self, name: str, item):
+        self.items.append(item)
+        self.sketch._changed(name)
+        return item
+
+    @property
+    def count(self):
+        return len(self.items)
+
+    def __iter__(self):
+        return iter(self.items)
+
+
+class _SketchPoints(_Collection):
+    def add(self, point: Point3D):
+        return self._added("SketchPoints.add", SketchPoint(self.sketch, point))
+
+    def point(self, p) -> SketchPoint:
+        """SketchPoint given or added at a Point3D, as lines take either."""
+        if isinstance(p, SketchPoint):
+            return p
+        point = SketchPoint(self.sketch, p)
+        self.items.append(point)
+        return point
+
+
+class _SketchLines(_Collection):
+    def addByTwoPoints(self, p1, p2):
+        points = self.sketch.sketchPoints
+        line = SketchLine(self.sketch, points.point(p1), points.point(p2))
+        return self._added("SketchLines.addByTwoPoints", line)
+
+
+class _SketchArcs(_Collection):
+    def addByCenterStartEnd(self, center, start, end):
+        points = self.sketch.sketchPoints
+        radius = math.dist(center.asArray(), start.asArray())
+        arc = SketchArc(self.sketch, points.point(start), points.point(end), radius)
+        return self._added("SketchArcs.addByCenterStartEnd", arc)
+
+    def addFillet(self, line1, point1, line2, point2, radius: float):
+        ends = [
+            self._trim(line, radius, line2 if line is line1 else line1)
+            for line in (line1, line2)
+        ]
+        arc = SketchArc(self.sketch, ends[0], ends[1], radius)
+        return self._added("SketchArcs.addFillet", arc)
+
+    def _trim(self, line: SketchLine, radius: float, other: SketchLine):
+        corner_is_start = line.startSketchPoint in (
+            other.startSketchPoint,
+            other.endSketchPoint,
+        )
+        corner = line.startSketchPoint if corner_is_start else line.endSketchPoint
+        far = line.endSketchPoint if corner_is_start else line.startSketchPoint
+        c, f = corner.geometry, far.geometry
+        other_far = (
+            other.endSketchPoint
+            if other.startSketchPoint is corner
+            else other.startSketchPoint
+        ).geometry
+        u = _unit(c, f)
+        v = _unit(c, other_far)
+        cos = max(-1.0, min(1.0, sum(a * b for a, b in zip(u, v))))
+        d = radius * math.sqrt((1 + cos) / (1 - cos))
+        tangent = self.sketch.sketchPoints.point(
+            Point3D(c.x + u[0] * d, c.y + u[1] * d, c.z + u[2] * d)
+        )
+        if corner_is_start:
+            line.startSketchPoint = tangent
+        else:
+            line.endSketchPoint = tangent
+        return tangent
+
+
+def _unit(p: Point3D, q: Point3D):
+    d = [q.x - p.x, q.y - p.y, q.z - p.z]
+    n = math.hypot(*d)
+    return [a / n for a in d]
+
+
+class _SketchFittedSplines(_Collection):
+    def add(self, points):
+        sketch_points = [self.sketch.sketchPoints.point(p) for p in points]
+        spline = SketchFittedSpline(self.sketch, sketch_points)
+        return self._added("SketchFittedSplines.add", spline)
+
+
+class _SketchCurves:
+    def __init__(self, sketch: Sketch):
+        self.sketchLines = _SketchLines(sketch)
+        self.sketchArcs = _SketchArcs(sketch)
+        self.sketchFittedSplines = _SketchFittedSplines(sketch)
+
+    def __iter__(self):
+        yield from self.sketchLines
+        yield from self.sketchArcs
+        yield from self.sketchFittedSplines
+
+    @property
+    def count(self):
+        return sum(1 for _ in self)
+
+
+class _Adder(_Collection):
+    """geometricConstraints or sketchDimensions; any add* method works."""
+
+    def __init__(self, sketch: Sketch, name: str, item_class):
+        super().__init__(sketch)
+        self.name = name
+        self.item_class = item_class
+
+    def __getattr__(self, method: str):
+        if not method.startswith("add"):
+            raise AttributeError(method)
+
+        def add(*entities):
+            item = self.item_class(method[3:], entities)
+            return self._added(f"{self.name}.{method}", item)
+
+        return add
+
+
+class Sketch(Base):
+    def __init__(self):
+        self._deferred = False
+        self._dirty = False
+        # names of the calls that changed the sketch, in order
+        self.history: list[str] = []
+        self.sketchPoints = _SketchPoints(self)
+        self.sketchCurves = _SketchCurves(self)
+        self.sketchTexts = _Collection(self)
+        self.geometricConstraints = _Adder(self, "GeometricConstraints", _Constraint)
+        self.sketchDimensions = _Adder(self, "SketchDimensions", SketchDimension)
+
+    @property
+    def isComputeDeferred(self):
+        return self._deferred
+
+    @isComputeDeferred.setter
+    def isComputeDeferred(self, value: bool):
+        if self._deferred and not value and self._dirty:
+            calls["solve"] += 1
+            self._dirty = False
+        self._deferred = value
+
+    def _changed(self, name: str):
+        calls[name] += 1
+        self.history.append(name)
+        if self._deferred:
+            self._dirty = True
+        else:
+            calls["solve"] += 1
@@ -1,11 +1,23 @@
 from __future__ import annotations
+import itertools
+import threading
+import time
 import traceback
-from collections.abc import Callable
-from typing import override
+from collections import OrderedDict
+from collections.abc import Callable, Iterable, Mapping
+from contextlib import nullcontext
+from graphlib import TopologicalSorter
+from typing import Any, NamedTuple, cast, override
 
 import adsk.core, adsk.fusion
-from .helpers import message_box, value_input
-from .command_values import load_command_values, store_command_values
+from .helpers import app_refresh, log, message_box, value_input
+from .command_values import (
+    CommandInputIndex,
+    load_command_values,
+    store_command_values,
+)
+from .command_presets import PresetStore, default_preset_store
+from .profiler import EventProfiler
 
 
 # Dummy list of the event handlers to prevent them from being garbage collected.
@@ -22,16 +34,54 @@ type EventHandler = (
     | adsk.core.ValidateInputsEventHandler
     | adsk.core.KeyboardEventHandler
     | adsk.core.MouseEventHandler
+    | adsk.core.CustomEventHandler
 )
 _handlers: list[EventHandler] = []
+# Handlers owned by each live Command, keyed by id(command),
+# released when the command is destroyed.
+_command_handlers: dict[int, list[EventHandler]] = {}
+
+
+def live_handler_count() -> int:
+    """Number of event handlers kept alive by this module, for diagnostics."""
+    return len(_handlers) + sum(len(h) for h in _command_handlers.values())
+
+
+class _ErrorLog:
+    """Writes tracebacks to the text commands palette at most once per
+    `interval` seconds, instead of a modal message box for each error
+    of a frequent event, and tells how many were suppressed meanwhile."""
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.last = -interval
+        self.suppressed = 0
+
+    def __call__(self, text: str):
+        now = time.perf_counter()
+        if now - self.last < self.interval:
+            self.suppressed += 1
+            return
+        if self.suppressed:
+            text = text.rstrip("\n") + f"\n({self.suppressed} more errors suppressed)"
+        self.last = now
+        self.suppressed = 0
+        log(text)
+
+
+_log_error = _ErrorLog(5.0)
 
 # Universal event handlers that handle events with given callback function.
 
 
 class CommandEventHandler(adsk.core.CommandEventHandler):
-    def __init__(self, handler: Callable[[adsk.core.CommandEventArgs], None]):
+    def __init__(
+        self,
+        handler: Callable[[adsk.core.CommandEventArgs], None],
+        owner: list[EventHandler] | None = None,
+    ):
         super().__init__()
-        _handlers.append(self)
+        (_handlers if owner is None else owner).append(self)
         self.handler = handler
 
     @override
@@ -45,9 +95,13 @@ class CommandEventHandler(adsk.core.CommandEventHandler):
 
 
 class InputChangedHandler(adsk.core.InputChangedEventHandler):
-    def __init__(self, handler: Callable[[adsk.core.InputChangedEventArgs], None]):
+    def __init__(
+        self,
+        handler: Callable[[adsk.core.InputChangedEventArgs], None],
+        owner: list[EventHandler] | None = None,
+    ):
         super().__init__()
-        _handlers.append(self)
+        (_handlers if owner is None else owner).append(self)
         self.handler = handler
 
     @override
@@ -61,9 +115,13 @@ class InputChangedHandler(adsk.core.InputChangedEventHandler):
 
 
 class ValidateInputsEventHandler(adsk.core.ValidateInputsEventHandler):
-    def __init__(self, handler: Callable[[adsk.core.ValidateInputsEventArgs], None]):
+    def __init__(
+        self,
+        handler: Callable[[adsk.core.ValidateInputsEventArgs], None],
+        owner: list[EventHandler] | None = None,
+    ):
         super().__init__()
-        _handlers.append(self)
+        (_handlers if owner is None else owner).append(self)
         self.handler = handler
 
     @override
@@ -77,9 +135,13 @@ class ValidateInputsEventHandler(adsk.core.ValidateInputsEventHandler):
 
 
 class CommandCreatedEventHandler(adsk.core.CommandCreatedEventHandler):
-    def __init__(self, handler: Callable[[adsk.core.CommandCreatedEventArgs], None]):
+    def __init__(
+        self,
+        handler: Callable[[adsk.core.CommandCreatedEventArgs], None],
+        owner: list[EventHandler] | None = None,
+    ):
         super().__init__()
-        _handlers.append(self)
+        (_handlers if owner is None else owner).append(self)
         self.handler = handler
 
     @override
@@ -93,9 +155,13 @@ class CommandCreatedEventHandler(adsk.core.CommandCreatedEventHandler):
 
 
 class KeyboardEventHandler(adsk.core.KeyboardEventHandler):
-    def __init__(self, handler: Callable[[adsk.core.KeyboardEventArgs], None]):
+    def __init__(
+        self,
+        handler: Callable[[adsk.core.KeyboardEventArgs], None],
+        owner: list[EventHandler] | None = None,
+    ):
         super().__init__()
-        _handlers.append(self)
+        (_handlers if owner is None else owner).append(self)
         self.handler = handler
 
     def notify(
@@ -104,17 +170,41 @@ class KeyboardEventHandler(adsk.core.KeyboardEventHandler):
         try:
             self.handler(args)
         except:  # pylint: disable=bare-except
-            message_box(traceback.format_exc())
+            _log_error(traceback.format_exc())
 
 
 class MouseEventHandler(adsk.core.MouseEventHandler):
-    def __init__(self, handler: Callable[[adsk.core.MouseEventArgs], None]):
+    def __init__(
+        self,
+        handler: Callable[[adsk.core.MouseEventArgs], None],
+        owner: list[EventHandler] | None = None,
+    ):
         super().__init__()
-        _handlers.append(self)
+        (_handlers if owner is None else owner).append(self)
         self.handler = handler
 
     def notify(
         self, args: adsk.core.MouseEventArgs
+    ):  # pylint: disable=arguments-renamed
+        try:
+            self.handler(args)
+        except:  # pylint: disable=bare-except
+            _log_error(traceback.format_exc())
+
+
+class CustomEventHandler(adsk.core.CustomEventHandler):
+    def __init__(
+        self,
+        handler: Callable[[adsk.core.CustomEventArgs], None],
+        owner: list[EventHandler] | None = None,
+    ):
+        super().__init__()
+        (_handlers if owner is None else owner).append(self)
+        self.handler = handler
+
+    @override
+    def notify(
+        self, args: adsk.core.CustomEventArgs
     ):  # pylint: disable=arguments-renamed
         try:
             self.handler(args)
@@ -122,6 +212,146 @@ class MouseEventHandler(adsk.core.MouseEventHandler):
             message_box(traceback.format_exc())
 
 
+# Fields of the event args kept by EventSnapshot.
+MOUSE_EVENT_FIELDS = (
+    "button",
+    "clickCount",
+    "keyboardModifiers",
+    "position",
+    "viewportPosition",
+    "wheelDelta",
+    "viewport",
+)
+KEYBOARD_EVENT_FIELDS = ("keyCode", "modifierMask", "viewport")
+
+
+class EventSnapshot:
+    """Copy of the fields of a MouseEventArgs or KeyboardEventArgs,
+    passed to a throttled handler in place of the args when the event is
+    delivered after Fusion 360 returned from it. Points are copied."""
+
+    def __init__(self, args: Any, fields: Iterable[str]):
+        for field in fields:
+            value = getattr(args, field, None)
+            if isinstance(value, (adsk.core.Point2D, adsk.core.Point3D)):
+                value = value.copy()
+            setattr(self, field, value)
+
+
+class _Throttle:
+    """Calls handler at most `rate` times a second. An event arriving
+    earlier is kept as an EventSnapshot, replacing any kept before, and
+    delivered by `flush` when the interval has passed. The timer thread
+    only fires the custom event of the command, whose handler calls
+    `flush` on the main thread."""
+
+    def __init__(
+        self,
+        handler: Callable[[Any], None],
+        rate: float,
+        event_id: str,
+        name: str,
+        fields: tuple[str, ...] = (),
+    ):
+        self.handler = handler
+        self.fields = fields
+        self.interval = 1 / rate
+        self.event_id = event_id
+        self.name = name
+        self.last = -self.interval
+        self.pending: Any = None
+        self.timer: threading.Timer | None = None
+        self.delivered = 0
+        self.coalesced = 0
+
+    def __call__(self, args: Any):
+        wait = self.last + self.interval - time.perf_counter()
+        if wait <= 0:
+            self.cancel()
+            self._deliver(args)
+            return
+        if self.pending is not None:
+            self.coalesced += 1
+        # the args are not valid after Fusion 360 returned from the event
+        self.pending = EventSnapshot(args, self.fields)
+        if self.timer is None:
+            self.timer = threading.Timer(
+                wait,
+                adsk.core.Application.get().fireCustomEvent,
+                (self.event_id, self.name),
+            )
+            self.timer.start()
+
+    def flush(self):
+        self.timer = None
+        args, self.pending = self.pending, None
+        if args is None:
+            return
+        # called by the custom event handler, which would show a message box
+        try:
+            self._deliver(args)
+        except:  # pylint: disable=bare-except
+            _log_error(traceback.format_exc())
+
+    def cancel(self):
+        if self.timer is not None:
+            self.timer.cancel()
+            self.timer = None
+        self.pending = None
+
+    def _deliver(self, args: Any):
+        self.last = time.perf_counter()
+        self.delivered += 1
+        self.handler(args)
+
+
+class PreviewStats:
+    """Counters of Command previews.
+    `requested` previews were fired by Fusion 360, of which `dropped` were
+    skipped by debouncing and `computed` ran on_execute_or_preview.
+    `cache_hits` and `cache_misses` count the lookups of `Command.cached`."""
+
+    def __init__(self):
+        self.requested = 0
+        self.dropped = 0
+        self.computed = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.total_time = 0.0
+        self.last_time = 0.0
+
+    def __repr__(self):
+        return (
+            f"PreviewStats(requested={self.requested}, dropped={self.dropped}, "
+            f"computed={self.computed}, cache_hits={self.cache_hits}, "
+            f"cache_misses={self.cache_misses}, "
+            f"total_time={self.total_time:.3f}, last_time={self.last_time:.3f})"
+        )
+
+
+class BatchReport(NamedTuple):
+    """Result of a variant run by `Command.run_batch`."""
+
+    index: int
+    values: dict[str, str]
+    seconds: float
+    error: str | None = None
+
+
+def parameter_grid(choices: Mapping[str, Iterable[Any]]) -> list[dict[str, str]]:
+    """All combinations of the choices of input values for `Command.run_batch`,
+    e.g. parameter_grid({"module": [1, 2], "teeth": [10, 20, 30]})."""
+    keys = list(choices)
+    return [
+        {k: str(v) for k, v in zip(keys, combination)}
+        for combination in itertools.product(*(choices[k] for k in keys))
+    ]
+
+
+# variants for the command being created by Command.run_batch
+_pending_batch: list[list[dict[str, str]]] = []
+
+
 class Command:
     """Universal command class for Fusion 360 add-ins.
     It handles the command lifecycle events by its methods
@@ -129,6 +359,31 @@ class Command:
 
     processing = False
     default_values: dict[str, str]
+    command: adsk.core.Command | None = None
+
+    # Seconds to wait after the last input change before computing a preview.
+    # Previews requested within this window are dropped and one preview is
+    # run when the inputs settle, so the last value is always applied.
+    preview_debounce = 0.0
+    # Number of input value sets whose `cached` results are kept.
+    preview_cache_size = 8
+    # Max calls per second of keyboard and mouse event methods,
+    # e.g. {"on_mouse_move": 30}. Events arriving faster are coalesced
+    # and the latest one is passed when the interval has passed, after
+    # Fusion 360 returned from the original event, as an EventSnapshot
+    # holding the fields in MOUSE_EVENT_FIELDS or KEYBOARD_EVENT_FIELDS.
+    event_throttle: dict[str, float] = {}
+    # Record call counts and times of the event handlers into `profiler`.
+    profile = False
+    # With profile, keep cProfile reports of this many slowest previews.
+    profile_slowest = 0
+    # Store the input values in one design attribute as JSON
+    # instead of one attribute per input.
+    store_values_as_blob = False
+    # Where the presets of the command values are saved.
+    preset_store: PresetStore = default_preset_store
+    # Minimum seconds between viewport refreshes while running a batch.
+    batch_refresh_interval = 1.0
 
     def __init__(
         self, _id: str, name: str, tooltip: str = "", resource_folder: str = ""
@@ -140,39 +395,163 @@ class Command:
                 _id, name, tooltip, resource_folder
             )
 
+        self.preview_stats = PreviewStats()
+        self.values_key: int | None = None
+        # input values read for the running preview or execute, by dotted id
+        self.input_values: dict[str, str] = {}
+        self._cache: OrderedDict[int, dict[str, Any]] = OrderedDict()
+        self._last_change = 0.0
+        self._debounce_timer: threading.Timer | None = None
+        self._throttles: dict[str, _Throttle] = {}
+        self._custom_event_id = _id + "_custom_event"
+        self._custom_event_registered = False
+        self._connections: list[tuple[Any, EventHandler]] = []
+        self.profiler = EventProfiler(self.profile_slowest) if self.profile else None
+        self._input_index: CommandInputIndex | None = None
+        self._applying_values = False
+        self.batch = _pending_batch.pop() if _pending_batch else None
+        self.batch_reports: list[BatchReport] = []
+        _command_handlers[id(self)] = []
+
         def command_created(args: adsk.core.CommandCreatedEventArgs):
             command = args.command
-            command.inputChanged.add(InputChangedHandler(self.on_changed))
-            command.validateInputs.add(
-                ValidateInputsEventHandler(self.on_validate_inputs)
+            self.command = command
+            self._input_index = None
+            if self.batch is not None:
+                # execute at once without showing the dialog
+                command.isAutoExecute = True
+            if self.preview_debounce > 0 or self._overrides("on_changed"):
+                self._connect(
+                    command.inputChanged,
+                    InputChangedHandler,
+                    self._input_changed,
+                    "on_changed",
+                )
+            if self._overrides("on_validate_inputs"):
+                self._connect(
+                    command.validateInputs,
+                    ValidateInputsEventHandler,
+                    self.on_validate_inputs,
+                )
+            if self._overrides("on_activate"):
+                self._connect(command.activate, CommandEventHandler, self.on_activate)
+            if self._overrides("on_deactivate"):
+                self._connect(
+                    command.deactivate, CommandEventHandler, self.on_deactivate
+                )
+            self._connect(command.execute, CommandEventHandler, self.on_execute)
+            # on_preview records only the previews it computes
+            self._connect(
+                command.executePreview,
+                CommandEventHandler,
+                self.on_preview,
+                profile=False,
+            )
+            self._connect(
+                command.destroy, CommandEventHandler, self._destroyed, "on_destroy"
             )
-            command.activate.add(CommandEventHandler(self.on_activate))
-            command.deactivate.add(CommandEventHandler(self.on_deactivate))
-            command.execute.add(CommandEventHandler(self.on_execute))
-            command.executePreview.add(CommandEventHandler(self.on_preview))
-            command.destroy.add(CommandEventHandler(self.on_destroy))
-            command.keyDown.add(KeyboardEventHandler(self.on_key_down))
-            command.keyUp.add(KeyboardEventHandler(self.on_key_up))
-            command.mouseMove.add(MouseEventHandler(self.on_mouse_move))
-            command.mouseDown.add(MouseEventHandler(self.on_mouse_down))
-            command.mouseUp.add(MouseEventHandler(self.on_mouse_up))
-            command.mouseClick.add(MouseEventHandler(self.on_mouse_click))
-            command.mouseDoubleClick.add(MouseEventHandler(self.on_mouse_double_click))
-            command.mouseDragBegin.add(MouseEventHandler(self.on_mouse_drag_begin))
-            command.mouseDrag.add(MouseEventHandler(self.on_mouse_drag))
-            command.mouseDragEnd.add(MouseEventHandler(self.on_mouse_drag_end))
-            command.mouseWheel.add(MouseEventHandler(self.on_mouse_wheel))
-            self.on_created(args)
+            # frequent events are handled only when the methods are overridden
+            self._throttles.clear()
+            for event, method, handler_class, fields in _INPUT_EVENTS:
+                if self._overrides(method):
+                    self._connect(
+                        getattr(command, event),
+                        handler_class,
+                        self._input_event_handler(method, fields),
+                        profile=False,
+                    )
+            with self._measure("on_created"):
+                self.on_created(args)
 
             # restore input values from design attributes
             # save default values, too
-            self.default_values = load_command_values(command)
-            self.on_changed(None)
-
-        self.cmd_def.commandCreated.add(CommandCreatedEventHandler(command_created))
+            with self._measure("load_command_values"):
+                self.default_values = load_command_values(
+                    command, self.store_values_as_blob, self.input_index()
+                )
+            with self._measure("on_changed"):
+                self.on_changed(None)
+
+            if self.preview_debounce > 0 or self._throttles:
+                app = adsk.core.Application.get()
+                app.unregisterCustomEvent(self._custom_event_id)
+                self._connect(
+                    app.registerCustomEvent(self._custom_event_id),
+                    CustomEventHandler,
+                    self._on_custom_event,
+                )
+                self._custom_event_registered = True
+
+        self._connect(
+            self.cmd_def.commandCreated, CommandCreatedEventHandler, command_created
+        )
         self.cmd_def.execute()
         adsk.autoTerminate(False)
 
+    def _overrides(self, method: str) -> bool:
+        return getattr(type(self), method) is not getattr(Command, method)
+
+    def _connect(
+        self,
+        event: Any,
+        handler_class: type[EventHandler],
+        handler: Callable[[Any], None],
+        name: str | None = None,
+        profile: bool = True,
+    ):
+        """Add a handler owned by this command to the event."""
+        if self.profiler is not None and profile:
+            handler = self.profiler.wrap(name or handler.__name__, handler)
+        owner = _command_handlers.setdefault(id(self), [])
+        event_handler = handler_class(handler, owner)  # type: ignore[call-arg]
+        event.add(event_handler)
+        self._connections.append((event, event_handler))
+
+    def release_handlers(self):
+        """Remove the handlers of this command from their events and
+        let them be collected. Called when the command is destroyed."""
+        for event, handler in self._connections:
+            try:
+                event.remove(handler)
+            except RuntimeError:
+                pass  # the event source is already gone
+        self._connections.clear()
+        _command_handlers.pop(id(self), None)
+
+    def _destroyed(self, args: adsk.core.CommandEventArgs):
+        try:
+            self.on_destroy(args)
+        finally:
+            if self._debounce_timer is not None:
+                self._debounce_timer.cancel()
+                self._debounce_timer = None
+            for throttle in self._throttles.values():
+                throttle.cancel()
+            if self._custom_event_registered:
+                app = adsk.core.Application.get()
+                app.unregisterCustomEvent(self._custom_event_id)
+                self._custom_event_registered = False
+            self.command = None
+            self.release_handlers()
+
+    def input_index(self, command: adsk.core.Command | None = None):
+        """Index of the command inputs, built on first use and kept.
+        Call invalidate_input_index after adding or removing inputs."""
+        if self._input_index is None:
+            command = command or self.command
+            if command is None:
+                raise RuntimeError("The command is not created yet.")
+            self._input_index = CommandInputIndex(command.commandInputs)
+        return self._input_index
+
+    def invalidate_input_index(self):
+        self._input_index = None
+
+    def _measure(self, name: str):
+        if self.profiler is None:
+            return nullcontext()
+        return self.profiler.measure(name)
+
     def on_created(self, args: adsk.core.CommandCreatedEventArgs):
         pass  # to be overridden
 
@@ -187,13 +566,177 @@ class Command:
     ):
         pass  # to be overridden
 
+    def cached(self, name: str, compute: Callable[[], Any]) -> Any:
+        """Return the result of compute() for the current input values,
+        computing it only when the values have not been seen recently.
+        Use it in on_execute_or_preview for the work that depends only on
+        the input values, e.g. a gear profile. Geometry created through
+        the API can not be cached, as Fusion 360 aborts each preview."""
+        key = self.values_key
+        entry = self._cache.get(key) if key is not None else None
+        if entry is not None and name in entry:
+            self.preview_stats.cache_hits += 1
+            self._cache.move_to_end(key)
+            return entry[name]
+        self.preview_stats.cache_misses += 1
+        result = compute()
+        if key is not None:
+            self._cache.setdefault(key, {})[name] = result
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.preview_cache_size:
+                self._cache.popitem(last=False)
+        return result
+
+    def _update_values_key(self, command: adsk.core.Command):
+        self.input_values = self.input_index(command).values()
+        self.values_key = hash(tuple(self.input_values.items()))
+
+    def _input_changed(self, args: adsk.core.InputChangedEventArgs):
+        self._last_change = time.perf_counter()
+        if not self._applying_values:
+            self.on_changed(args)
+
+    def preset_names(self) -> list[str]:
+        return self.preset_store.names(self.cmd_def.id)
+
+    def save_preset(self, name: str):
+        """Save the current input values as a preset."""
+        self.preset_store.save(self.cmd_def.id, name, self.input_index().values())
+
+    def delete_preset(self, name: str):
+        self.preset_store.delete(self.cmd_def.id, name)
+
+    def load_preset(self, name: str):
+        """Set the input values of a preset. on_changed is called once
+        after all the values are set, instead of once for each input,
+        followed by a single preview."""
+        values = self.preset_store.get(self.cmd_def.id, name)
+        if values is None:
+            raise KeyError(f"No preset named {name!r}.")
+        self.apply_values(values)
+
+    def apply_values(self, values: dict[str, str], preview: bool = True):
+        index = self.input_index()
+        self._applying_values = True
+        try:
+            for key, value in values.items():
+                index.set_value(key, value)
+        finally:
+            self._applying_values = False
+        self.on_changed(None)
+        if preview and self.command is not None:
+            self.command.doExecutePreview()
+
+    @classmethod
+    def run_batch(
+        cls, variants: Iterable[Mapping[str, Any]], *args: Any, **kwargs: Any
+    ):
+        """Create the command with the given constructor arguments and, instead
+        of showing the dialog, execute it once for each variant of input values
+        (dotted ids to values, see `parameter_grid`). Inputs not in a variant
+        keep the values of the previous one. The reports are passed to
+        on_batch_done when all the variants have run."""
+        _pending_batch.append(
+            [{k: str(v) for k, v in values.items()} for values in variants]
+        )
+        try:
+            return cls(*args, **kwargs)
+        finally:
+            _pending_batch.clear()
+
+    def _run_batch(self, args: adsk.core.CommandEventArgs):
+        variants = self.batch or []
+        self.batch_reports = []
+        last_refresh = time.perf_counter()
+        for i, values in enumerate(variants):
+            start = time.perf_counter()
+            error = None
+            try:
+                self.apply_values(values, preview=False)
+                self._update_values_key(args.command)
+                self.on_execute_or_preview(args, False)
+            except:  # pylint: disable=bare-except
+                error = traceback.format_exc()
+            now = time.perf_counter()
+            self.batch_reports.append(BatchReport(i, values, now - start, error))
+            self.on_batch_progress(i + 1, len(variants))
+            if now - last_refresh >= self.batch_refresh_interval:
+                app_refresh()
+                last_refresh = time.perf_counter()
+        self.on_batch_done(self.batch_reports)
+
+    def on_batch_progress(self, done: int, total: int):
+        pass  # to be overridden
+
+    def on_batch_done(self, reports: list[BatchReport]):
+        """Write the time of each variant and the errors to the TextCommands
+        palette. Override to handle the reports in other ways."""
+        lines = [
+            f"{r.index:>4} {r.seconds * 1e3:>9.1f} ms"
+            f"{' FAILED' if r.error else ''} {r.values}"
+            for r in reports
+        ]
+        total = sum(r.seconds for r in reports)
+        lines.append(f"{len(reports)} variants in {total:.2f} s")
+        lines += [r.error for r in reports if r.error]
+        log(lines)
+
+    def _input_event_handler(
+        self, method: str, fields: tuple[str, ...]
+    ) -> Callable[[Any], None]:
+        handler = getattr(self, method)
+        if self.profiler is not None:
+            # the calls of the method, not the events a throttle coalesces
+            handler = self.profiler.wrap(method, handler)
+        rate = self.event_throttle.get(method)
+        if not rate:
+            return handler
+        throttle = _Throttle(handler, rate, self._custom_event_id, method, fields)
+        self._throttles[method] = throttle
+        return throttle
+
+    def throttle_stats(self) -> dict[str, tuple[int, int]]:
+        """(delivered, coalesced) counts of each throttled event method."""
+        return {k: (t.delivered, t.coalesced) for k, t in self._throttles.items()}
+
+    def _on_custom_event(self, args: adsk.core.CustomEventArgs):
+        if self.command is None or not self.command.isValid:
+            return
+        if args.additionalInfo == "preview":
+            self._debounce_timer = None
+            self.command.doExecutePreview()
+        elif args.additionalInfo in self._throttles:
+            self._throttles[args.additionalInfo].flush()
+
+    def _debounce(self) -> bool:
+        """Schedule a preview when the inputs settle and return True
+        if the inputs have changed within the debounce window."""
+        wait = self._last_change + self.preview_debounce - time.perf_counter()
+        if wait <= 0:
+            return False
+        if self._debounce_timer is not None:
+            self._debounce_timer.cancel()
+        # the timer thread may only fire a custom event,
+        # which Fusion 360 delivers on the main thread
+        self._debounce_timer = threading.Timer(
+            wait,
+            adsk.core.Application.get().fireCustomEvent,
+            (self._custom_event_id, "preview"),
+        )
+        self._debounce_timer.start()
+        return True
+
     def on_execute(self, args: adsk.core.CommandEventArgs):
         app = adsk.core.Application.get()
         design = adsk.fusion.Design.cast(app.activeProduct)
         timeline_start = design.timeline.markerPosition
         try:
             self.processing = True
-            self.on_execute_or_preview(args, False)
+            if self.batch is not None:
+                self._run_batch(args)
+            else:
+                self._update_values_key(args.command)
+                self.on_execute_or_preview(args, False)
         except:
             message_box(traceback.format_exc())
         finally:
@@ -206,14 +749,31 @@ class Command:
             adsk.terminate()
 
     def on_preview(self, args: adsk.core.CommandEventArgs):
+        stats = self.preview_stats
+        stats.requested += 1
+        if self.preview_debounce > 0 and self._debounce():
+            stats.dropped += 1
+            return
+        start = time.perf_counter()
         try:
             self.processing = True
-            self.on_execute_or_preview(args, True)
+            self._update_values_key(args.command)
+            if self.profiler is not None:
+                self.profiler.profile_call(
+                    "on_preview", self.on_execute_or_preview, args, True
+                )
+            else:
+                self.on_execute_or_preview(args, True)
         except:
             # message_box(traceback.format_exc())
             pass
         finally:
             self.processing = False
+            stats.computed += 1
+            stats.last_time = time.perf_counter() - start
+            stats.total_time += stats.last_time
+            if self.profiler is not None:
+                self.profiler.record("on_preview", stats.last_time)
 
     def on_destroy(self, _: adsk.core.CommandEventArgs):
         if not self.processing:
@@ -259,13 +819,53 @@ class Command:
         pass  # to be overridden
 
 
+def stage(*inputs: str, after: Iterable[str] = ()):
+    """Mark a TabInput method as a stage of its execution.
+    `inputs` are the ids of the command inputs the stage reads, relative to
+    the tab (e.g. "size" or "group.size"), and `after` names the stages
+    whose results it uses. The method takes no arguments and its return
+    value is stored in `TabInput.results` under the method name."""
+
+    def decorator(method: Callable[[Any], Any]):
+        method.stage = (tuple(inputs), tuple(after))  # type: ignore[attr-defined]
+        return method
+
+    return decorator
+
+
+_INPUT_EVENTS = (
+    ("keyDown", "on_key_down", KeyboardEventHandler, KEYBOARD_EVENT_FIELDS),
+    ("keyUp", "on_key_up", KeyboardEventHandler, KEYBOARD_EVENT_FIELDS),
+    ("mouseMove", "on_mouse_move", MouseEventHandler, MOUSE_EVENT_FIELDS),
+    ("mouseDown", "on_mouse_down", MouseEventHandler, MOUSE_EVENT_FIELDS),
+    ("mouseUp", "on_mouse_up", MouseEventHandler, MOUSE_EVENT_FIELDS),
+    ("mouseClick", "on_mouse_click", MouseEventHandler, MOUSE_EVENT_FIELDS),
+    (
+        "mouseDoubleClick",
+        "on_mouse_double_click",
+        MouseEventHandler,
+        MOUSE_EVENT_FIELDS,
+    ),
+    ("mouseDragBegin", "on_mouse_drag_begin", MouseEventHandler, MOUSE_EVENT_FIELDS),
+    ("mouseDrag", "on_mouse_drag", MouseEventHandler, MOUSE_EVENT_FIELDS),
+    ("mouseDragEnd", "on_mouse_drag_end", MouseEventHandler, MOUSE_EVENT_FIELDS),
+    ("mouseWheel", "on_mouse_wheel", MouseEventHandler, MOUSE_EVENT_FIELDS),
+)
+
+
 class TabInput[Parent]:
     """Each tab of a TabbedCommand should be derived from this class.
-    It provides a simple interface for creating tabbed commands."""
+    It provides a simple interface for creating tabbed commands.
+
+    The work of a tab can be split into methods decorated by `stage`.
+    They run before on_execute_or_preview, which then builds the geometry
+    from `self.results`. A stage runs again only when one of its inputs
+    changed or an upstream stage ran again; otherwise its result is kept."""
 
     tab: adsk.core.TabCommandInput
     id = ""
     name = ""
+    _stages: list[tuple[str, tuple[str, ...], tuple[str, ...]]] | None = None
 
     def __init__(
         self,
@@ -276,6 +876,9 @@ class TabInput[Parent]:
         self.parent = parent
         if self.id == "" or self.name == "":
             raise NotImplementedError("Give id and name for the tab.")
+        self.results: dict[str, Any] = {}
+        self.stage_runs: dict[str, int] = {}
+        self._stage_inputs: dict[str, tuple[str | None, ...]] = {}
         self.tab = inputs.addTabCommandInput(self.id, self.name)
         self.on_created(args, self.tab.children)
 
@@ -292,6 +895,50 @@ class TabInput[Parent]:
     ):
         pass  # to be overridden
 
+    @classmethod
+    def stages(cls):
+        """(name, inputs, after) of the stages in the order to run."""
+        if cls.__dict__.get("_stages") is None:
+            specs: dict[str, tuple[tuple[str, ...], tuple[str, ...]]] = {}
+            for klass in reversed(cls.__mro__):
+                for name, member in vars(klass).items():
+                    if hasattr(member, "stage"):
+                        specs[name] = member.stage
+            for name, (_, after) in specs.items():
+                for upstream in after:
+                    if upstream not in specs:
+                        raise ValueError(f"Unknown stage {upstream!r} in {name!r}.")
+            order = TopologicalSorter({k: v[1] for k, v in specs.items()})
+            cls._stages = [(k, *specs[k]) for k in order.static_order()]
+        return cls._stages
+
+    def run_stages(self):
+        """Run the stages whose inputs changed and the stages downstream of them."""
+        stages = self.stages()
+        if not stages:
+            return
+        # the values the command read for this preview, without the tab id
+        prefix = self.tab.id + "."
+        values = {
+            k[len(prefix) :]: v
+            for k, v in cast(Command, self.parent).input_values.items()
+            if k.startswith(prefix)
+        }
+        rerun: set[str] = set()
+        for name, inputs, after in stages:
+            current = tuple(values.get(i) for i in inputs)
+            if (
+                name in self.results
+                and self._stage_inputs.get(name) == current
+                and rerun.isdisjoint(after)
+            ):
+                continue
+            self.results.pop(name, None)
+            self.results[name] = getattr(self, name)()
+            self._stage_inputs[name] = current
+            self.stage_runs[name] = self.stage_runs.get(name, 0) + 1
+            rerun.add(name)
+
 
 class TabbedCommand(Command):
     """Command with tabs. Each tab has its own execution context.
@@ -331,11 +978,14 @@ class TabbedCommand(Command):
     ):
         if not is_preview:
             # store the parameters into design attributes
-            store_command_values(args.command)
+            store_command_values(
+                args.command, self.store_values_as_blob, self.input_index()
+            )
 
         # execute the active tab
         for tab in self.tabs:
             if tab.tab.isActive:
+                tab.run_stages()
                 tab.on_execute_or_preview(args, is_preview)
                 break
 
@@ -0,0 +1,63 @@
+"""Named presets of command values stored in local JSON files.
+
+Each command id has its own file in the preset folder, which is read on the
+first access to the presets of that command and written on each change.
+Values are the dictionaries of `get_command_values`.
+"""
+
+from __future__ import annotations
+import json
+import os
+
+
+class PresetStore:
+    """Named sets of command values kept in `folder`
+    (~/.fusion360_helper/presets by default)."""
+
+    def __init__(self, folder: str | None = None):
+        self.folder = folder or os.path.join(
+            os.path.expanduser("~"), ".fusion360_helper", "presets"
+        )
+        self._presets: dict[str, dict[str, dict[str, str]]] = {}
+
+    def _path(self, command_id: str):
+        return os.path.join(self.folder, command_id + ".json")
+
+    def _load(self, command_id: str) -> dict[str, dict[str, str]]:
+        presets = self._presets.get(command_id)
+        if presets is None:
+            try:
+                with open(self._path(command_id), "r", encoding="utf-8") as f:
+                    presets = json.load(f)
+            except (OSError, ValueError):
+                presets = {}
+            self._presets[command_id] = presets
+        return presets
+
+    def _write(self, command_id: str):
+        os.makedirs(self.folder, exist_ok=True)
+        path = self._path(command_id)
+        with open(path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(self._presets[command_id], f, indent=1, sort_keys=True)
+        os.replace(path + ".tmp", path)
+
+    def names(self, command_id: str) -> list[str]:
+        return sorted(self._load(command_id))
+
+    def get(self, command_id: str, name: str) -> dict[str, str] | None:
+        return self._load(command_id).get(name)
+
+    def save(self, command_id: str, name: str, values: dict[str, str]):
+        self._load(command_id)[name] = dict(values)
+        self._write(command_id)
+
+    def delete(self, command_id: str, name: str):
+        if self._load(command_id).pop(name, None) is not None:
+            self._write(command_id)
+
+    def reload(self):
+        """Forget the presets read so far, to read the files again."""
+        self._presets.clear()
+
+
+default_preset_store = PresetStore()
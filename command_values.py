@@ -2,37 +2,198 @@
 in design attributes.
 load_command_values(cmd) - load command values from design attributes
 store_command_values(cmd) - store command values in design attributes
+
+By default each value is an attribute named by its key. With blob=True all
+values are stored in one attribute as versioned JSON, which is read first;
+values stored by key are still read when it is missing, and are deleted
+when the values are stored as a blob.
+
+Only the values differing from the defaults (the values before loading)
+are stored, and only the attributes whose values changed are written.
 """
 
 from __future__ import annotations
-from typing import cast
+import json
+from typing import NamedTuple, cast
 
 import adsk.core, adsk.fusion
 
+# attribute name and format version of the values stored as a blob
+BLOB_NAME = "__values__"
+BLOB_VERSION = 1
+
+# values as last loaded from or stored into the design,
+# keyed by (document creationId, command id)
+_stored_values: dict[tuple[str, str], dict[str, str]] = {}
+# keys stored as separate attributes, to be removed when stored as a blob
+_legacy_keys: dict[tuple[str, str], list[str]] = {}
+# values of the command inputs before loading
+_default_values: dict[tuple[str, str], dict[str, str]] = {}
+
+
+class StoreResult(NamedTuple):
+    """Numbers of attributes written and deleted by store_command_values,
+    and of values whose writes were skipped as they had not changed."""
 
-def load_command_values(cmd: adsk.core.Command):
+    written: int
+    deleted: int
+    skipped: int
+
+
+def _cache_key(design: adsk.fusion.Design, command_name: str):
+    return (design.parentDocument.creationId, command_name)
+
+
+def load_command_values(
+    cmd: adsk.core.Command,
+    blob: bool = False,
+    index: CommandInputIndex | None = None,
+):
     """Load command values from design attributes and
     fill the input fields of the command.
     It returns a dictionary with the default values of the command inputs.
     """
     design = adsk.fusion.Design.cast(adsk.core.Application.get().activeProduct)
     command_name = cmd.parentCommandDefinition.id
-    default_values = get_command_values(cmd.commandInputs)
-    for key in default_values:
-        attr = design.attributes.itemByName(command_name, key)
-        if attr:
-            set_command_value(cmd.commandInputs, key, attr.value)
+    if index is None:
+        index = CommandInputIndex(cmd.commandInputs)
+    default_values = index.values()
+    cache_key = _cache_key(design, command_name)
+
+    stored = _load_blob(design, command_name) if blob else None
+    if stored is None:
+        stored = {}
+        for key in default_values:
+            attr = design.attributes.itemByName(command_name, key)
+            if attr:
+                stored[key] = attr.value
+        _legacy_keys[cache_key] = list(stored) if blob else []
+    else:
+        _legacy_keys[cache_key] = []
+    _stored_values[cache_key] = stored
+    _default_values[cache_key] = default_values
+
+    for key, value in stored.items():
+        if key in default_values:
+            index.set_value(key, value)
     return default_values
 
 
-def store_command_values(cmd: adsk.core.Command):
-    """Store command values in design attributes."""
+def _load_blob(design: adsk.fusion.Design, command_name: str):
+    attr = design.attributes.itemByName(command_name, BLOB_NAME)
+    if not attr:
+        return None
+    try:
+        data = json.loads(attr.value)
+    except ValueError:
+        return None
+    if not isinstance(data, dict) or data.get("version") != BLOB_VERSION:
+        return None
+    return cast(dict[str, str], data["values"])
+
+
+def store_command_values(
+    cmd: adsk.core.Command,
+    blob: bool = False,
+    index: CommandInputIndex | None = None,
+):
+    """Store command values in design attributes.
+    Values equal to the defaults are not stored and their attributes are
+    deleted. Values the same as last loaded or stored are not written."""
 
     design = adsk.fusion.Design.cast(adsk.core.Application.get().activeProduct)
     command_name = cmd.parentCommandDefinition.id
-    values = get_command_values(cmd.commandInputs)
-    for key, value in values.items():
-        design.attributes.add(command_name, key, value)
+    if index is None:
+        index = CommandInputIndex(cmd.commandInputs)
+    values = index.values()
+    cache_key = _cache_key(design, command_name)
+    defaults = _default_values.get(cache_key, {})
+    stored = _stored_values.get(cache_key, {})
+    changed = {k: v for k, v in values.items() if defaults.get(k) != v}
+    written = deleted = 0
+
+    if blob:
+        legacy = _legacy_keys.get(cache_key, [])
+        if changed != stored or legacy:
+            if changed:
+                design.attributes.add(
+                    command_name,
+                    BLOB_NAME,
+                    json.dumps(
+                        {"version": BLOB_VERSION, "values": changed},
+                        separators=(",", ":"),
+                    ),
+                )
+                written = 1
+            else:
+                deleted += _delete_attribute(design, command_name, BLOB_NAME)
+            # migrate from the values stored by key
+            for key in legacy:
+                deleted += _delete_attribute(design, command_name, key)
+            _legacy_keys[cache_key] = []
+        skipped = 0 if written or deleted else len(values)
+    else:
+        for key, value in changed.items():
+            if stored.get(key) != value:
+                design.attributes.add(command_name, key, value)
+                written += 1
+        for key in stored:
+            if key in values and key not in changed:
+                # back to the default
+                deleted += _delete_attribute(design, command_name, key)
+        skipped = len(values) - written - deleted
+    _stored_values[cache_key] = changed
+    return StoreResult(written, deleted, skipped)
+
+
+def _delete_attribute(design: adsk.fusion.Design, command_name: str, key: str):
+    attr = design.attributes.itemByName(command_name, key)
+    return 1 if attr and attr.deleteMe() else 0
+
+
+class CommandInputIndex:
+    """Flattened index of a command input tree, built in one pass.
+    `entries` maps each dotted id (e.g. "tab.group.size") to the input
+    and its objectType, in the order of get_command_values. Build it again
+    after adding or removing inputs."""
+
+    def __init__(self, items: adsk.core.CommandInputs, prepend: str = ""):
+        self.entries: dict[str, tuple[adsk.core.CommandInput, str]] = {}
+        self._add(items, prepend)
+
+    def _add(self, items: adsk.core.CommandInputs, prepend: str):
+        for item in items:
+            if item.commandInputs != items:
+                continue
+            key = prepend + item.id
+            object_type = item.objectType
+            self.entries[key] = (item, object_type)
+            if object_type in _CONTAINER_TYPES:
+                self._add(cast(adsk.core.GroupCommandInput, item).children, key + ".")
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, key: str):
+        return key in self.entries
+
+    def values(self) -> dict[str, str]:
+        """Same as get_command_values for the indexed items."""
+        result: dict[str, str] = {}
+        for key, (item, object_type) in self.entries.items():
+            value = _input_value(item, object_type)
+            if value is not None:
+                result[key] = value
+        return result
+
+    def set_value(self, key: str, value: str):
+        """Same as set_command_value for the indexed items."""
+        entry = self.entries.get(key)
+        if entry is not None:
+            _set_input_value(entry[0], entry[1], value)
+
+
+_CONTAINER_TYPES = ("adsk::core::TabCommandInput", "adsk::core::GroupCommandInput")
 
 
 def get_command_values(
@@ -41,98 +202,75 @@ def get_command_values(
     """Create a dictionary with the command values.
     The key is prepend + item.id and the value is the command value.
     """
-    result: dict[str, str] = {}
-    for item in items:
-        if item.commandInputs != items:
-            continue
-        key = prepend + item.id
-        match item.objectType:
-            case "adsk::core::TabCommandInput":
-                result[key] = (
-                    "1" if cast(adsk.core.TabCommandInput, item).isActive else "0"
-                )
-                result.update(
-                    get_command_values(
-                        cast(adsk.core.TabCommandInput, item).children, key + "."
-                    )
-                )
-            case "adsk::core::GroupCommandInput":
-                result[key] = (
-                    "1" if cast(adsk.core.GroupCommandInput, item).isExpanded else "0"
-                )
-                result.update(
-                    get_command_values(
-                        cast(adsk.core.GroupCommandInput, item).children, key + "."
-                    )
-                )
-            # case "adsk::core::ImageCommandInput":
-            #     cast(adsk.core.ImageCommandInput, item).imageFile = str(value)
-            #     cast(adsk.core.ImageCommandInput, item).scaleFactor = str(value)
-            # case "adsk::core::TableCommandInput":
-            #     cast(adsk.core.TableCommandInput, item).commandInputs
-            case "adsk::core::TriadCommandInput":
-                result[key] = ",".join(
-                    str(f)
-                    for f in cast(adsk.core.TriadCommandInput, item).transform.asArray()
-                )
-            case "adsk::core::ValueCommandInput":
-                result[key] = str(cast(adsk.core.ValueCommandInput, item).value)
-            case "adsk::core::BoolValueCommandInput":
-                result[key] = (
-                    "1" if cast(adsk.core.BoolValueCommandInput, item).value else "0"
-                )
-            case "adsk::core::TextBoxCommandInput":
-                result[key] = cast(adsk.core.TextBoxCommandInput, item).text
-            # case "adsk::core::BrowserCommandInput":
-            #     cast(adsk.core.BrowserCommandInput, item).htmlFileURL
-            case "adsk::core::DropDownCommandInput":
-                result[key] = str(
-                    cast(adsk.core.DropDownCommandInput, item).selectedItem.index
-                )
-            # case "adsk::core::ButtonRowCommandInput":
-            #     cast(adsk.core.ButtonRowCommandInput, item).listItems
-            # case "adsk::core::DirectionCommandInput":
-            #     result[key] = str(
-            #         vector.Vector(cast(adsk.core.DirectionCommandInput, item).manipulatorDirection)
-            #     )
-            # case "adsk::core::SelectionCommandInput":
-            #     cast(adsk.core.SelectionCommandInput, item).selectionCount
-            # case "adsk::core::SeparatorCommandInput":
-            #     cast(adsk.core.SeparatorCommandInput, item).isVisible
-            case "adsk::core::AngleValueCommandInput":
-                result[key] = str(cast(adsk.core.AngleValueCommandInput, item).value)
-            case "adsk::core::StringValueCommandInput":
-                result[key] = cast(adsk.core.StringValueCommandInput, item).value
-            case "adsk::core::FloatSliderCommandInput":
-                float_slider = cast(adsk.core.FloatSliderCommandInput, item)
-                result[key] = str(float_slider.valueOne)
-                if float_slider.hasTwoSliders:
-                    result[key] += "," + str(float_slider.valueTwo)
-            case "adsk::core::FloatSpinnerCommandInput":
-                result[key] = str(cast(adsk.core.FloatSpinnerCommandInput, item).value)
-            # case "adsk::core::DistanceValueCommandInput":
-            #     result[key] = str(cast(adsk.core.DistanceValueCommandInput, item).value)
-            case "adsk::core::IntegerSliderCommandInput":
-                integer_slider = cast(adsk.core.IntegerSliderCommandInput, item)
-                result[key] = str(integer_slider.valueOne)
-                if integer_slider.hasTwoSliders:
-                    result[key] += "," + str(integer_slider.valueTwo)
-            case "adsk::core::IntegerSpinnerCommandInput":
-                result[key] = str(
-                    cast(adsk.core.IntegerSpinnerCommandInput, item).value
-                )
-            case "adsk::core::RadioButtonGroupCommandInput":
-                result[key] = str(
-                    cast(
-                        adsk.core.RadioButtonGroupCommandInput, item
-                    ).selectedItem.index
-                )
-    return result
+    return CommandInputIndex(items, prepend).values()
+
+
+def _input_value(item: adsk.core.CommandInput, object_type: str) -> str | None:
+    match object_type:
+        case "adsk::core::TabCommandInput":
+            return "1" if cast(adsk.core.TabCommandInput, item).isActive else "0"
+        case "adsk::core::GroupCommandInput":
+            return "1" if cast(adsk.core.GroupCommandInput, item).isExpanded else "0"
+        # case "adsk::core::ImageCommandInput":
+        #     cast(adsk.core.ImageCommandInput, item).imageFile = str(value)
+        #     cast(adsk.core.ImageCommandInput, item).scaleFactor = str(value)
+        # case "adsk::core::TableCommandInput":
+        #     cast(adsk.core.TableCommandInput, item).commandInputs
+        case "adsk::core::TriadCommandInput":
+            return ",".join(
+                str(f)
+                for f in cast(adsk.core.TriadCommandInput, item).transform.asArray()
+            )
+        case "adsk::core::ValueCommandInput":
+            return str(cast(adsk.core.ValueCommandInput, item).value)
+        case "adsk::core::BoolValueCommandInput":
+            return "1" if cast(adsk.core.BoolValueCommandInput, item).value else "0"
+        case "adsk::core::TextBoxCommandInput":
+            return cast(adsk.core.TextBoxCommandInput, item).text
+        # case "adsk::core::BrowserCommandInput":
+        #     cast(adsk.core.BrowserCommandInput, item).htmlFileURL
+        case "adsk::core::DropDownCommandInput":
+            return str(cast(adsk.core.DropDownCommandInput, item).selectedItem.index)
+        # case "adsk::core::ButtonRowCommandInput":
+        #     cast(adsk.core.ButtonRowCommandInput, item).listItems
+        # case "adsk::core::DirectionCommandInput":
+        #     result[key] = str(
+        #         vector.Vector(cast(adsk.core.DirectionCommandInput, item).manipulatorDirection)
+        #     )
+        # case "adsk::core::SelectionCommandInput":
+        #     cast(adsk.core.SelectionCommandInput, item).selectionCount
+        # case "adsk::core::SeparatorCommandInput":
+        #     cast(adsk.core.SeparatorCommandInput, item).isVisible
+        case "adsk::core::AngleValueCommandInput":
+            return str(cast(adsk.core.AngleValueCommandInput, item).value)
+        case "adsk::core::StringValueCommandInput":
+            return cast(adsk.core.StringValueCommandInput, item).value
+        case "adsk::core::FloatSliderCommandInput":
+            float_slider = cast(adsk.core.FloatSliderCommandInput, item)
+            if float_slider.hasTwoSliders:
+                return f"{float_slider.valueOne},{float_slider.valueTwo}"
+            return str(float_slider.valueOne)
+        case "adsk::core::FloatSpinnerCommandInput":
+            return str(cast(adsk.core.FloatSpinnerCommandInput, item).value)
+        # case "adsk::core::DistanceValueCommandInput":
+        #     result[key] = str(cast(adsk.core.DistanceValueCommandInput, item).value)
+        case "adsk::core::IntegerSliderCommandInput":
+            integer_slider = cast(adsk.core.IntegerSliderCommandInput, item)
+            if integer_slider.hasTwoSliders:
+                return f"{integer_slider.valueOne},{integer_slider.valueTwo}"
+            return str(integer_slider.valueOne)
+        case "adsk::core::IntegerSpinnerCommandInput":
+            return str(cast(adsk.core.IntegerSpinnerCommandInput, item).value)
+        case "adsk::core::RadioButtonGroupCommandInput":
+            return str(
+                cast(adsk.core.RadioButtonGroupCommandInput, item).selectedItem.index
+            )
+    return None
 
 
 def set_command_value(items: adsk.core.CommandInputs, key: str, value: str):
     """Set the value of a CommandInput corresponding to the given key."""
-    name, *children = key.split(".", 2)
+    name, *children = key.split(".", 1)
     item = items.itemById(name)
     if item is None:
         return
@@ -147,8 +285,11 @@ def set_command_value(items: adsk.core.CommandInputs, key: str, value: str):
                     cast(adsk.core.GroupCommandInput, item).children, children[0], value
                 )
         return
+    _set_input_value(item, item.objectType, value)
+
 
-    match item.objectType:
+def _set_input_value(item: adsk.core.CommandInput, object_type: str, value: str):
+    match object_type:
         case "adsk::core::TabCommandInput":
             if int(value):
                 cast(adsk.core.TabCommandInput, item).activate()
@@ -6,6 +6,7 @@ from typing import cast
 import adsk.core, adsk.fusion
 
 from .helpers import collection, value_input
+from .transform import Transform
 
 
 def comp_built_joint_revolute(
@@ -255,12 +256,67 @@ def comp_rectangular_pattern(
     return comp.features.rectangularPatternFeatures.add(inp)
 
 
+class CompiledMove:
+    """Transform chain of `comp_move_free` composed once in Python.
+
+    The matrixes are applied in the given order, wrapped by the inverse of
+    `occurrence.transform2` and `occurrence.transform2` if an occurrence is
+    given, exactly as `comp_move_free` does. The Matrix3D for the API and
+    the inverse move are created on first use and cached, so the same
+    instance can be passed to `comp_move_free` any number of times without
+    repeating API work."""
+
+    def __init__(
+        self,
+        matrixes: (
+            adsk.core.Matrix3D | Transform | Iterable[adsk.core.Matrix3D | Transform]
+        ),
+        occurrence: adsk.fusion.Occurrence | None = None,
+        tolerance: float = 1e-9,
+    ):
+        if not isinstance(matrixes, Iterable):
+            matrixes = [matrixes]
+        transforms = [
+            m if isinstance(m, Transform) else Transform.from_matrix3d(m)
+            for m in matrixes
+        ]
+        if occurrence is not None:
+            trans = Transform.from_matrix3d(occurrence.transform2)
+            transforms = [trans.inverse(), *transforms, trans]
+        self.transform = Transform.chain(transforms)
+        self.tolerance = tolerance
+        self.is_identity = self.transform.is_identity(tolerance)
+        self._matrix: adsk.core.Matrix3D | None = None
+        self._inverse: CompiledMove | None = None
+
+    @property
+    def matrix(self):
+        if self._matrix is None:
+            self._matrix = self.transform.to_matrix3d()
+        return self._matrix
+
+    def inverse(self):
+        if self._inverse is None:
+            self._inverse = CompiledMove(self.transform.inverse(), None, self.tolerance)
+            self._inverse._inverse = self
+        return self._inverse
+
+
 def comp_move_free(
     comp: adsk.fusion.Component,
     entities: adsk.core.Base | Iterable[adsk.core.Base],
-    matrixes: adsk.core.Matrix3D | Iterable[adsk.core.Matrix3D],
+    matrixes: adsk.core.Matrix3D | Iterable[adsk.core.Matrix3D] | CompiledMove,
     occurrence: adsk.fusion.Occurrence | None = None,
 ):
+    if isinstance(matrixes, CompiledMove):
+        # occurrence is already taken into account by CompiledMove
+        if matrixes.is_identity:
+            return None
+        inp = comp.features.moveFeatures.createInput2(
+            collection(entities),
+        )
+        inp.defineAsFreeMove(matrixes.matrix)
+        return comp.features.moveFeatures.add(inp)
     if not isinstance(matrixes, Iterable):
         matrixes = [matrixes]
     if occurrence is not None:
@@ -278,6 +334,25 @@ def comp_move_free(
     return comp.features.moveFeatures.add(inp)
 
 
+def comp_move_free_grouped(
+    comp: adsk.fusion.Component,
+    moves: Iterable[tuple[adsk.core.Base | Iterable[adsk.core.Base], CompiledMove]],
+):
+    """Move entities by their CompiledMove, creating a single move feature
+    for all entities sharing the same transform. Identity moves are skipped.
+    Returns the created move features."""
+    groups: dict[Transform, tuple[CompiledMove, list[adsk.core.Base]]] = {}
+    for entities, move in moves:
+        if move.is_identity:
+            continue
+        group = groups.setdefault(move.transform, (move, []))[1]
+        if isinstance(entities, Iterable):
+            group.extend(entities)
+        else:
+            group.append(entities)
+    return [comp_move_free(comp, entities, move) for move, entities in groups.values()]
+
+
 def comp_move_rotate(
     comp: adsk.fusion.Component,
     entities: adsk.core.Base | Iterable[adsk.core.Base],
@@ -1,5 +1,13 @@
+from __future__ import annotations
+import math
+from bisect import bisect_right
+from itertools import accumulate
+from typing import NamedTuple
+
 import adsk.core, adsk.fusion
 
+from .vector import Vector, _vector
+
 
 def curve3d_point(curve: adsk.core.Curve3D, t: float):
     """
@@ -8,3 +16,136 @@ def curve3d_point(curve: adsk.core.Curve3D, t: float):
     extents = curve.evaluator.getParameterExtents()
     p = extents[1] + (extents[2] - extents[1]) * t
     return curve.evaluator.getPointAtParameter(p)[1]
+
+
+class CurveFrame(NamedTuple):
+    origin: Vector
+    tangent: Vector
+    normal: Vector
+    binormal: Vector
+
+
+class Curve3DSampler:
+    """
+    Samples a curve at points evenly spaced by arc length.
+
+    The evaluator and the parameter extents are fetched once. On the first
+    arc-length query, `resolution + 1` points are evaluated in one
+    `getPointsAtParameters` call to build a cumulative length table, after
+    which each arc length is mapped to a parameter by binary search.
+    The lengths are those of the polyline through the table points.
+    """
+
+    def __init__(self, curve: adsk.core.Curve3D, resolution: int = 256):
+        self.evaluator = curve.evaluator
+        _, self.start, self.end = self.evaluator.getParameterExtents()
+        self.resolution = resolution
+        self._parameters: list[float] = []
+        self._lengths: list[float] = []
+
+    def _table(self):
+        if not self._lengths:
+            n = self.resolution
+            span = self.end - self.start
+            self._parameters = [self.start + span * i / n for i in range(n + 1)]
+            self._parameters[-1] = self.end
+            _, points = self.evaluator.getPointsAtParameters(self._parameters)
+            coords = [(p.x, p.y, p.z) for p in points]
+            self._lengths = list(
+                accumulate(map(math.dist, coords, coords[1:]), initial=0.0)
+            )
+        return self._parameters, self._lengths
+
+    @property
+    def length(self) -> float:
+        return self._table()[1][-1]
+
+    def point(self, t: float) -> adsk.core.Point3D:
+        """Same as `curve3d_point` (0 <= t <= 1 in parameter space)."""
+        p = self.start + (self.end - self.start) * t
+        return self.evaluator.getPointAtParameter(p)[1]
+
+    def parameter_at_length(self, length: float) -> float:
+        """Curve parameter at the given arc length from the start."""
+        parameters, lengths = self._table()
+        length = min(max(length, 0.0), lengths[-1])
+        i = min(bisect_right(lengths, length), len(lengths) - 1) - 1
+        segment = lengths[i + 1] - lengths[i]
+        f = (length - lengths[i]) / segment if segment > 0 else 0.0
+        return parameters[i] + (parameters[i + 1] - parameters[i]) * f
+
+    def parameters(self, count: int, endpoint: bool = True) -> list[float]:
+        """Parameters of `count` points evenly spaced by arc length.
+        With endpoint=False the last point is not at the end of the curve,
+        which suits closed curves."""
+        if count <= 0:
+            return []
+        total = self.length
+        divisions = count - 1 if endpoint else count
+        step = total / divisions if divisions > 0 else 0.0
+        return [self.parameter_at_length(step * i) for i in range(count)]
+
+    def points(self, count: int, endpoint: bool = True) -> list[adsk.core.Point3D]:
+        """`count` points evenly spaced by arc length."""
+        parameters = self.parameters(count, endpoint)
+        if not parameters:
+            return []
+        return list(self.evaluator.getPointsAtParameters(parameters)[1])
+
+    def tangents(self, count: int, endpoint: bool = True) -> list[adsk.core.Vector3D]:
+        """Tangent vectors at `count` points evenly spaced by arc length."""
+        parameters = self.parameters(count, endpoint)
+        if not parameters:
+            return []
+        return list(self.evaluator.getTangents(parameters)[1])
+
+    def frames(
+        self, count: int, endpoint: bool = True, normal: Vector | None = None
+    ) -> list[CurveFrame]:
+        """
+        Rotation minimizing frames at `count` points evenly spaced by arc length.
+        The first normal is `normal` made perpendicular to the tangent, or
+        any perpendicular vector if not given. The frames then follow the
+        curve without twisting (double reflection method).
+        """
+        parameters = self.parameters(count, endpoint)
+        if not parameters:
+            return []
+        _, points = self.evaluator.getPointsAtParameters(parameters)
+        _, tangents = self.evaluator.getTangents(parameters)
+        origins = [_vector(p.x, p.y, p.z) for p in points]
+        tangents = [_vector(t.x, t.y, t.z) for t in tangents]
+        for i, t in enumerate(tangents):
+            if not t:  # singular point, use the chord direction instead
+                j, k = max(i - 1, 0), min(i + 1, len(origins) - 1)
+                t = origins[k] - origins[j]
+            tangents[i] = t.normalize()
+
+        t = tangents[0]
+        if normal is None or abs(normal.cross(t)) < 1e-9:
+            # the axis least aligned with the tangent
+            normal = min(
+                (
+                    _vector(1.0, 0.0, 0.0),
+                    _vector(0.0, 1.0, 0.0),
+                    _vector(0.0, 0.0, 1.0),
+                ),
+                key=lambda axis: abs(axis.dot(t)),
+            )
+        r = (normal - t * normal.dot(t)).normalize()
+
+        frames = [CurveFrame(origins[0], t, r, t.cross(r))]
+        for i in range(1, len(origins)):
+            v1 = origins[i] - origins[i - 1]
+            c1 = v1.dot(v1)
+            if c1 > 0:
+                r = r - v1 * (2 / c1 * v1.dot(r))
+                t = t - v1 * (2 / c1 * v1.dot(t))
+            v2 = tangents[i] - t
+            c2 = v2.dot(v2)
+            if c2 > 0:
+                r = r - v2 * (2 / c2 * v2.dot(r))
+            t = tangents[i]
+            r = (r - t * r.dot(t)).normalize()
+            frames.append(CurveFrame(origins[i], t, r, t.cross(r)))
+        return frames
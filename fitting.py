@@ -0,0 +1,849 @@
+"""Least-squares fitting of lines and planes to large point sets.
+
+`PointStatistics` accumulates the centroid and covariance of points in a
+single pass (Welford / Chan et al.), so points can be fed in chunks from a
+generator in O(1) memory and without losing precision on data far from
+the origin. The `*_array` functions are batch versions of the fitters in
+`vector.py`; with NumPy each chunk is reduced in a vectorized pass and the
+fit is the eigen decomposition of the 3x3 covariance.
+
+The `robust_*` functions fit lines, planes and circles to data with
+outliers by RANSAC or LMedS and return the inlier mask along with the model.
+
+Circles can be computed for many point triples at once, fitted to N points
+by least squares, and a polyline can be split into line and arc segments
+or decimated within a tolerance.
+"""
+
+from __future__ import annotations
+import math
+import operator
+import random
+import statistics
+import sys
+from collections.abc import Callable, Iterable
+from contextlib import nullcontext
+from typing import NamedTuple
+
+from .vector import Vector, _vector
+from .vector_array import Column, VectorArray, _apply, _sum, np
+
+
+class PointStatistics:
+    """Running centroid and covariance of a point set."""
+
+    def __init__(self, points: VectorArray | Iterable[Vector] | None = None):
+        self.n = 0
+        self.mean = [0.0, 0.0, 0.0]
+        # sums of products of deviations from the mean; xx, xy, xz, yy, yz, zz
+        self.m2 = [0.0] * 6
+        if points is not None:
+            self.update(points)
+
+    def add(self, p: Vector):
+        """Add a single point."""
+        self.n += 1
+        mean = self.mean
+        dx = p.x - mean[0]
+        dy = p.y - mean[1]
+        dz = p.z - mean[2]
+        mean[0] += dx / self.n
+        mean[1] += dy / self.n
+        mean[2] += dz / self.n
+        ex = p.x - mean[0]
+        ey = p.y - mean[1]
+        ez = p.z - mean[2]
+        m2 = self.m2
+        m2[0] += dx * ex
+        m2[1] += dx * ey
+        m2[2] += dx * ez
+        m2[3] += dy * ey
+        m2[4] += dy * ez
+        m2[5] += dz * ez
+
+    def update(self, points: VectorArray | Iterable[Vector]):
+        """Add a chunk of points. A VectorArray is reduced in one vectorized
+        pass when NumPy is available; other iterables are consumed lazily."""
+        if not isinstance(points, VectorArray):
+            for p in points:
+                self.add(p)
+            return self
+        if np is None:
+            for p in points:
+                self.add(p)
+            return self
+        n = len(points)
+        if n == 0:
+            return self
+        mx, my, mz = points.x.mean(), points.y.mean(), points.z.mean()
+        dx, dy, dz = points.x - mx, points.y - my, points.z - mz
+        chunk = PointStatistics()
+        chunk.n = n
+        chunk.mean = [float(mx), float(my), float(mz)]
+        chunk.m2 = [
+            float(dx @ dx),
+            float(dx @ dy),
+            float(dx @ dz),
+            float(dy @ dy),
+            float(dy @ dz),
+            float(dz @ dz),
+        ]
+        return self.merge(chunk)
+
+    def merge(self, other: PointStatistics):
+        """Combine the statistics of another point set into this one."""
+        if other.n == 0:
+            return self
+        n = self.n + other.n
+        delta = [b - a for a, b in zip(self.mean, other.mean)]
+        f = self.n * other.n / n
+        self.mean = [a + d * other.n / n for a, d in zip(self.mean, delta)]
+        for k, (i, j) in enumerate(_PAIRS):
+            self.m2[k] += other.m2[k] + delta[i] * delta[j] * f
+        self.n = n
+        return self
+
+    def centroid(self):
+        return _vector(*self.mean)
+
+    def covariance(self) -> list[list[float]]:
+        """Population covariance matrix as a 3x3 nested list."""
+        xx, xy, xz, yy, yz, zz = (m / self.n for m in self.m2)
+        return [[xx, xy, xz], [xy, yy, yz], [xz, yz, zz]]
+
+    def fit2d_by_line(self):
+        """Same as `vector.fit2d_by_line`; regression of y on x,
+        returns (point, direction) or None."""
+        if self.n < 2 or self.m2[0] == 0:
+            return None
+        a = self.m2[1] / self.m2[0]
+        b = self.mean[1] - a * self.mean[0]
+        return _vector(0.0, b, 0.0), _vector(1.0, a, 0.0)
+
+    def fit3d_by_line(self):
+        """Orthogonal least-squares line, returns (point, direction) or None."""
+        if self.n < 2:
+            return None
+        values, vectors = _symmetric_eigen(self.covariance())
+        if values[2] <= 0:
+            return None
+        return self.centroid(), vectors[2]
+
+    def fit3d_by_plane(self):
+        """Orthogonal least-squares plane, returns (normal, centroid) or None."""
+        if self.n < 3:
+            return None
+        values, vectors = _symmetric_eigen(self.covariance())
+        if values[1] <= _DEGENERATE * values[2]:
+            return None
+        return vectors[0], self.centroid()
+
+
+_PAIRS = ((0, 0), (0, 1), (0, 2), (1, 1), (1, 2), (2, 2))
+
+# relative variance below which the points are regarded as collinear
+_DEGENERATE = 1e-12
+
+
+def _symmetric_eigen(m: list[list[float]]) -> tuple[list[float], list[Vector]]:
+    """Eigenvalues (ascending) and unit eigenvectors of a symmetric 3x3 matrix.
+
+    The largest-magnitude component of each eigenvector is positive, as in
+    `vector.fit3d_by_plane`, so that both backends return the same signs.
+    """
+    if np is not None:
+        values, vectors = np.linalg.eigh(np.array(m))
+        return values.tolist(), [
+            _positive_major(*vectors[:, i].tolist()) for i in range(3)
+        ]
+
+    # cyclic Jacobi rotations
+    a = [row[:] for row in m]
+    v = [[1.0, 0.0, 0.0], [0.0, 1.0, 0.0], [0.0, 0.0, 1.0]]
+    for _ in range(50):
+        off = a[0][1] ** 2 + a[0][2] ** 2 + a[1][2] ** 2
+        if off <= 1e-30 * (a[0][0] ** 2 + a[1][1] ** 2 + a[2][2] ** 2) or off == 0:
+            break
+        for p, q in ((0, 1), (0, 2), (1, 2)):
+            if a[p][q] == 0:
+                continue
+            theta = (a[q][q] - a[p][p]) / (2 * a[p][q])
+            t = math.copysign(1.0, theta) / (abs(theta) + math.hypot(theta, 1.0))
+            c = 1 / math.hypot(t, 1.0)
+            s = t * c
+            for k in range(3):
+                akp, akq = a[k][p], a[k][q]
+                a[k][p] = c * akp - s * akq
+                a[k][q] = s * akp + c * akq
+            for k in range(3):
+                apk, aqk = a[p][k], a[q][k]
+                a[p][k] = c * apk - s * aqk
+                a[q][k] = s * apk + c * aqk
+            for k in range(3):
+                vkp, vkq = v[k][p], v[k][q]
+                v[k][p] = c * vkp - s * vkq
+                v[k][q] = s * vkp + c * vkq
+    order = sorted(range(3), key=lambda i: a[i][i])
+    return [a[i][i] for i in order], [
+        _positive_major(v[0][i], v[1][i], v[2][i]) for i in order
+    ]
+
+
+def _positive_major(x: float, y: float, z: float) -> Vector:
+    if max((x, y, z), key=abs) < 0:
+        return _vector(-x, -y, -z)
+    return _vector(x, y, z)
+
+
+def _as_array(points: VectorArray | Iterable[Vector]):
+    if isinstance(points, VectorArray):
+        return points
+    return VectorArray.from_vectors(points)
+
+
+def fit2d_by_line_array(points: VectorArray | Iterable[Vector]):
+    """Batch version of `vector.fit2d_by_line`, returns (point, direction)."""
+    return PointStatistics(_as_array(points)).fit2d_by_line()
+
+
+def fit3d_by_line_array(points: VectorArray | Iterable[Vector]):
+    """Batch version of `vector.fit3d_by_line`,
+    returns (centroid, direction) or None."""
+    return PointStatistics(_as_array(points)).fit3d_by_line()
+
+
+def fit3d_by_plane_array(points: VectorArray | Iterable[Vector]):
+    """Batch version of `vector.fit3d_by_plane`,
+    returns (normal, centroid) or None."""
+    return PointStatistics(_as_array(points)).fit3d_by_plane()
+
+
+def robust_fit3d_by_line(
+    points: VectorArray | Iterable[Vector],
+    threshold: float | None = None,
+    method: str = "ransac",
+    max_iterations: int = 1000,
+    confidence: float = 0.99,
+    stop_ratio: float | None = None,
+    seed: int | None = None,
+):
+    """Fit a line ignoring outliers, returns ((point, direction), inliers)
+    or (None, None). See `robust_fit` for the parameters."""
+    return robust_fit(
+        points,
+        2,
+        _line_from_2points,
+        _line_residuals,
+        lambda inliers: PointStatistics(inliers).fit3d_by_line(),
+        threshold,
+        method,
+        max_iterations,
+        confidence,
+        stop_ratio,
+        seed,
+    )
+
+
+def robust_fit3d_by_plane(
+    points: VectorArray | Iterable[Vector],
+    threshold: float | None = None,
+    method: str = "ransac",
+    max_iterations: int = 1000,
+    confidence: float = 0.99,
+    stop_ratio: float | None = None,
+    seed: int | None = None,
+):
+    """Fit a plane ignoring outliers, returns ((normal, centroid), inliers)
+    or (None, None). See `robust_fit` for the parameters."""
+    return robust_fit(
+        points,
+        3,
+        _plane_from_3points,
+        _plane_residuals,
+        lambda inliers: PointStatistics(inliers).fit3d_by_plane(),
+        threshold,
+        method,
+        max_iterations,
+        confidence,
+        stop_ratio,
+        seed,
+    )
+
+
+def robust_fit3d_by_circle(
+    points: VectorArray | Iterable[Vector],
+    threshold: float | None = None,
+    method: str = "ransac",
+    max_iterations: int = 1000,
+    confidence: float = 0.99,
+    stop_ratio: float | None = None,
+    seed: int | None = None,
+):
+    """Fit a circle in 3D ignoring outliers, returns
+    ((center, normal, radius), inliers) or (None, None).
+    See `robust_fit` for the parameters."""
+    return robust_fit(
+        points,
+        3,
+        _circle_from_3points,
+        _circle_residuals,
+        fit3d_by_circle,
+        threshold,
+        method,
+        max_iterations,
+        confidence,
+        stop_ratio,
+        seed,
+    )
+
+
+def robust_fit(
+    points: VectorArray | Iterable[Vector],
+    sample_size: int,
+    model_from_sample: Callable[..., tuple | None],
+    residuals: Callable[[VectorArray, tuple], Column],
+    refine: Callable[[VectorArray], tuple | None] | None,
+    threshold: float | None = None,
+    method: str = "ransac",
+    max_iterations: int = 1000,
+    confidence: float = 0.99,
+    stop_ratio: float | None = None,
+    seed: int | None = None,
+):
+    """Generic RANSAC / LMedS estimator.
+
+    `model_from_sample` builds a model from `sample_size` points (None for
+    degenerate samples) and `residuals` returns the distance of every point
+    to a model in one vectorized call.
+
+    method "ransac" maximizes the number of points within `threshold`,
+    "lmeds" minimizes the median residual and derives the threshold from it
+    when `threshold` is None. The number of iterations adapts to the inlier
+    ratio found so far for the given `confidence`; the search also stops as
+    soon as the inlier ratio reaches `stop_ratio`. `seed` makes the sampling
+    reproducible. The best model is refitted to its inliers with `refine`.
+
+    Returns (model, inliers) where inliers is a boolean mask over points,
+    or (None, None) if no model was found.
+    """
+    if method not in ("ransac", "lmeds"):
+        raise ValueError(f"Unknown method: {method}")
+    if method == "ransac" and threshold is None:
+        raise ValueError("RANSAC requires a threshold")
+    points = _as_array(points)
+    n = len(points)
+    if n < sample_size:
+        return None, None
+
+    rng = random.Random(seed)
+    best_model = None
+    best_count = -1
+    best_median = math.inf
+    iterations = max_iterations
+    if method == "lmeds":
+        # assume up to a half of the points are outliers
+        iterations = min(iterations, _iterations_needed(0.5, sample_size, confidence))
+    i = 0
+    while i < iterations:
+        i += 1
+        model = model_from_sample(
+            *(points[j] for j in rng.sample(range(n), sample_size))
+        )
+        if model is None:
+            continue
+        r = residuals(points, model)
+        if method == "lmeds":
+            median = _median(r)
+            if median < best_median:
+                best_median = median
+                best_model = model
+            continue
+        count = _count(_within(r, threshold))
+        if count > best_count:
+            best_count = count
+            best_model = model
+            if stop_ratio is not None and count >= stop_ratio * n:
+                break
+            iterations = min(
+                iterations, _iterations_needed(count / n, sample_size, confidence)
+            )
+
+    if best_model is None:
+        return None, None
+    if method == "lmeds" and threshold is None:
+        # robust standard deviation by Rousseeuw & Leroy
+        sigma = 1.4826 * (1 + 5 / max(n - sample_size, 1)) * best_median
+        threshold = 2.5 * sigma
+    inliers = _within(residuals(points, best_model), threshold)
+    if refine is not None and _count(inliers) > sample_size:
+        refined = refine(_select(points, inliers))
+        if refined is not None:
+            best_model = refined
+            inliers = _within(residuals(points, best_model), threshold)
+    return best_model, inliers
+
+
+def _iterations_needed(inlier_ratio: float, sample_size: int, confidence: float):
+    """Number of samples needed to draw an all-inlier sample with confidence."""
+    p = inlier_ratio**sample_size
+    if p >= 1:
+        return 1
+    if p <= 0:
+        return sys.maxsize
+    return math.ceil(math.log(1 - confidence) / math.log(1 - p))
+
+
+def _line_from_2points(p1: Vector, p2: Vector):
+    d = p2 - p1
+    if not d:
+        return None
+    return p1, d.normalize()
+
+
+def _line_residuals(points: VectorArray, model: tuple[Vector, Vector]) -> Column:
+    return (points - model[0]).cross(model[1]).norm()
+
+
+def _plane_from_3points(p1: Vector, p2: Vector, p3: Vector):
+    normal = (p2 - p1).cross(p3 - p1)
+    if abs(normal) <= _DEGENERATE * abs(p2 - p1) * abs(p3 - p1):
+        return None
+    return normal.normalize(), p1
+
+
+def _plane_residuals(points: VectorArray, model: tuple[Vector, Vector]) -> Column:
+    return _apply(abs, (points - model[1]).dot(model[0]))
+
+
+def _circle_from_3points(p1: Vector, p2: Vector, p3: Vector):
+    a = p1 - p3
+    b = p2 - p3
+    axb = a.cross(b)
+    axb2 = axb.dot(axb)
+    if axb2 <= _DEGENERATE * a.dot(a) * b.dot(b):
+        return None
+    center = p3 + (b * a.dot(a) - a * b.dot(b)).cross(axb) / (2 * axb2)
+    return center, axb.normalize(), abs(p1 - center)
+
+
+def _circle_residuals(
+    points: VectorArray, model: tuple[Vector, Vector, float]
+) -> Column:
+    center, normal, radius = model
+    d = points - center
+    h = d.dot(normal)
+    # abs() guards against tiny negative values due to rounding
+    return _apply(
+        lambda d2, h: ((abs(d2 - h * h) ** 0.5 - radius) ** 2 + h * h) ** 0.5,
+        d.dot(d),
+        h,
+    )
+
+
+if np is not None:
+
+    def _within(residuals: Column, threshold: float):
+        return residuals <= threshold
+
+    def _count(mask) -> int:
+        return int(np.count_nonzero(mask))
+
+    def _median(column: Column) -> float:
+        return float(np.median(column))
+
+    def _select(points: VectorArray, mask) -> VectorArray:
+        return points[mask]
+
+    def _inverse_where(values: Column, condition: Column) -> Column:
+        return np.divide(
+            1.0, values, out=np.full(len(values), math.inf), where=condition > 0
+        )
+
+else:
+
+    def _within(residuals: Column, threshold: float):
+        return [r <= threshold for r in residuals]
+
+    def _count(mask) -> int:
+        return sum(mask)
+
+    def _median(column: Column) -> float:
+        return statistics.median(column)
+
+    def _select(points: VectorArray, mask) -> VectorArray:
+        return VectorArray.from_vectors(p for p, m in zip(points, mask) if m)
+
+    def _inverse_where(values: Column, condition: Column) -> Column:
+        return _apply(lambda v, c: 1.0 / v if c > 0 else math.inf, values, condition)
+
+
+def circles_from_3points(p1: VectorArray, p2: VectorArray, p3: VectorArray):
+    """Circumscribed circles of many triangles at once.
+
+    Returns (centers, normals, radii). Nearly collinear triples have an
+    infinite radius and non-finite center and normal instead of raising
+    an error."""
+    a = p1 - p3
+    b = p2 - p3
+    c = a - b
+    axb = a.cross(b)
+    a2 = a.dot(a)
+    b2 = b.dot(b)
+    axb2 = axb.dot(axb)
+    # 1 / |a x b|^2, or inf for (nearly) collinear points
+    inv = _inverse_where(
+        axb2, _apply(lambda n, a2, b2: n - _DEGENERATE * a2 * b2, axb2, a2, b2)
+    )
+    # 0 * inf gives nan for degenerate triples
+    with nullcontext() if np is None else np.errstate(invalid="ignore"):
+        centers = p3 + (b * a2 - a * b2).cross(axb) * _apply(lambda i: i / 2, inv)
+        normals = axb * _apply(lambda i: i**0.5, inv)
+        radii = _apply(
+            lambda a2, b2, c2, i: (a2 * b2 * c2 * i) ** 0.5 / 2, a2, b2, c.dot(c), inv
+        )
+    return centers, normals, radii
+
+
+def fit2d_by_circle(points: VectorArray | Iterable[Vector]):
+    """Least-squares circle on xy plane (Kasa fit on centered coordinates),
+    returns (center, radius) or None if the points are collinear."""
+    points = _as_array(points)
+    n = len(points)
+    if n < 3:
+        return None
+    mx = _sum(points.x) / n
+    my = _sum(points.y) / n
+    u = _apply(lambda x: x - mx, points.x)
+    v = _apply(lambda y: y - my, points.y)
+    suu = _sum(_apply(lambda u: u * u, u))
+    svv = _sum(_apply(lambda v: v * v, v))
+    suv = _sum(_apply(operator.mul, u, v))
+    suuu_uvv = _sum(_apply(lambda u, v: u * (u * u + v * v), u, v))
+    svvv_vuu = _sum(_apply(lambda u, v: v * (u * u + v * v), u, v))
+    det = suu * svv - suv * suv
+    if det <= _DEGENERATE * (suu * svv):
+        return None
+    a = (suuu_uvv * svv - svvv_vuu * suv) / (2 * det)
+    b = (svvv_vuu * suu - suuu_uvv * suv) / (2 * det)
+    radius = (a * a + b * b + (suu + svv) / n) ** 0.5
+    return _vector(a + mx, b + my, 0.0), radius
+
+
+def fit3d_by_circle(points: VectorArray | Iterable[Vector]):
+    """Least-squares circle in 3D; the points are projected onto their
+    best-fit plane and fitted there. Returns (center, normal, radius) or None.
+    """
+    points = _as_array(points)
+    plane = PointStatistics(points).fit3d_by_plane()
+    if plane is None:
+        return None
+    normal, origin = plane
+    u = normal.cross(_vector(1.0, 0.0, 0.0))
+    if abs(u) < 0.5:
+        u = normal.cross(_vector(0.0, 1.0, 0.0))
+    u = u.normalize()
+    w = normal.cross(u)
+    d = points - origin
+    circle = fit2d_by_circle(VectorArray(d.dot(u), d.dot(w)))
+    if circle is None:
+        return None
+    center, radius = circle
+    return origin + u * center.x + w * center.y, normal, radius
+
+
+class PolylineSegment(NamedTuple):
+    """Part of a polyline; points[start:end + 1] are approximated by a line,
+    or by an arc of the given center and radius."""
+
+    kind: str  # "line" or "arc"
+    start: int
+    end: int
+    center: Vector | None = None
+    radius: float | None = None
+
+
+def split_polyline(
+    points: VectorArray | Iterable[Vector],
+    tolerance: float,
+    min_arc_points: int = 5,
+    max_radius: float = math.inf,
+):
+    """Split a polyline on xy plane into lines and arcs.
+
+    Segments are grown greedily. A line and a circle are fitted to the
+    growing run by incremental least squares (O(1) per point), and the run
+    ends when the new point and the middle point of the run are off both
+    fits by more than `tolerance`. Every point of the run is then checked
+    against the final fit, and the run is shrunk until all of them are
+    within `tolerance`, so that it usually takes linear time. Arcs need at
+    least `min_arc_points` points; a line is preferred when both fit.
+    Consecutive segments share their end points.
+    """
+    if not isinstance(points, (list, tuple)):
+        points = list(points)
+    n = len(points)
+    if n < 2:
+        return []
+    xs = [p.x for p in points]
+    ys = [p.y for p in points]
+    result: list[PolylineSegment] = []
+    s = 0
+    while s < n - 1:
+        line = _LineMoments(xs[s], ys[s])
+        circle = _CircleMoments(xs[s], ys[s])
+        line.add(xs[s + 1], ys[s + 1])
+        circle.add(xs[s + 1], ys[s + 1])
+        last_line = s + 1
+        last_arc = -1
+        arc = None
+        j = s + 2
+        line_ok = arc_ok = True
+        while j < n and (line_ok or arc_ok):
+            x, y = xs[j], ys[j]
+            m = (s + j) // 2
+            if line_ok:
+                line.add(x, y)
+                line_ok = (
+                    line.distance(x, y) <= tolerance
+                    and line.distance(xs[m], ys[m]) <= tolerance
+                )
+                if line_ok:
+                    last_line = j
+            if arc_ok:
+                circle.add(x, y)
+                fit = circle.fit()
+                arc_ok = (
+                    fit is not None
+                    and fit[2] <= max_radius
+                    and _circle_distance(fit, x, y) <= tolerance
+                    and _circle_distance(fit, xs[m], ys[m]) <= tolerance
+                    and _circle_distance(fit, xs[s], ys[s]) <= tolerance
+                )
+                if arc_ok:
+                    last_arc = j
+                    arc = fit
+            j += 1
+        # the running checks only look at a few points of the run
+        last_line, _ = _longest_run(
+            lambda e: _line_run(xs, ys, s, e, tolerance), s + 1, last_line
+        )
+        if arc is not None and last_arc > last_line:
+            last_arc, arc = _longest_run(
+                lambda e: _arc_run(xs, ys, s, e, tolerance, max_radius),
+                max(s + min_arc_points - 1, last_line + 1),
+                last_arc,
+            )
+        if arc is not None and last_arc > last_line:
+            cx, cy, radius = arc
+            result.append(
+                PolylineSegment("arc", s, last_arc, _vector(cx, cy, 0.0), radius)
+            )
+            s = last_arc
+        else:
+            result.append(PolylineSegment("line", s, last_line))
+            s = last_line
+    return result
+
+
+def _longest_run(fit_run, lo: int, hi: int):
+    """Largest end in [lo, hi] whose run `fit_run` accepts, and its fit.
+
+    `fit_run(end)` returns the fit or None. Tries `hi` first and bisects
+    when it fails; returns (lo - 1, None) if no end is accepted.
+    """
+    if lo <= hi:
+        fit = fit_run(hi)
+        if fit is not None:
+            return hi, fit
+    best = (lo - 1, None)
+    hi -= 1
+    while lo <= hi:
+        m = (lo + hi) // 2
+        fit = fit_run(m)
+        if fit is None:
+            hi = m - 1
+        else:
+            best = (m, fit)
+            lo = m + 1
+    return best
+
+
+def _line_run(xs: list[float], ys: list[float], s: int, e: int, tolerance: float):
+    """The line fit of points[s:e + 1] if all of them are within tolerance."""
+    line = _LineMoments(xs[s], ys[s])
+    for j in range(s + 1, e + 1):
+        line.add(xs[j], ys[j])
+    if e - s > 1 and any(
+        line.distance(xs[j], ys[j]) > tolerance for j in range(s, e + 1)
+    ):
+        return None
+    return line
+
+
+def _arc_run(
+    xs: list[float],
+    ys: list[float],
+    s: int,
+    e: int,
+    tolerance: float,
+    max_radius: float,
+):
+    """The circle fit of points[s:e + 1] if all of them are within tolerance."""
+    circle = _CircleMoments(xs[s], ys[s])
+    for j in range(s + 1, e + 1):
+        circle.add(xs[j], ys[j])
+    fit = circle.fit()
+    if fit is None or fit[2] > max_radius:
+        return None
+    if any(_circle_distance(fit, xs[j], ys[j]) > tolerance for j in range(s, e + 1)):
+        return None
+    return fit
+
+
+class _LineMoments:
+    """Running orthogonal line fit of 2D points (Welford)."""
+
+    def __init__(self, x: float, y: float):
+        self.n = 1
+        self.mx = x
+        self.my = y
+        self.sxx = self.sxy = self.syy = 0.0
+
+    def add(self, x: float, y: float):
+        self.n += 1
+        dx = x - self.mx
+        dy = y - self.my
+        self.mx += dx / self.n
+        self.my += dy / self.n
+        self.sxx += dx * (x - self.mx)
+        self.sxy += dx * (y - self.my)
+        self.syy += dy * (y - self.my)
+
+    def distance(self, x: float, y: float):
+        t = 0.5 * math.atan2(2 * self.sxy, self.sxx - self.syy)
+        return abs((x - self.mx) * math.sin(t) - (y - self.my) * math.cos(t))
+
+
+class _CircleMoments:
+    """Running Kasa circle fit of 2D points relative to the first point."""
+
+    def __init__(self, x: float, y: float):
+        self.x0 = x
+        self.y0 = y
+        self.n = 1
+        self.sx = self.sy = self.sxx = self.sxy = self.syy = 0.0
+        self.sxz = self.syz = 0.0
+
+    def add(self, x: float, y: float):
+        x -= self.x0
+        y -= self.y0
+        z = x * x + y * y
+        self.n += 1
+        self.sx += x
+        self.sy += y
+        self.sxx += x * x
+        self.sxy += x * y
+        self.syy += y * y
+        self.sxz += x * z
+        self.syz += y * z
+
+    def fit(self):
+        """Returns (cx, cy, radius) or None."""
+        n, sx, sy = self.n, self.sx, self.sy
+        sxx, sxy, syy = self.sxx, self.sxy, self.syy
+        # x^2 + y^2 + D x + E y + F = 0 by Cramer's rule
+        m = ((sxx, sxy, sx), (sxy, syy, sy), (sx, sy, n))
+        r = (-self.sxz, -self.syz, -(sxx + syy))
+        det = _det3(m)
+        if abs(det) <= _DEGENERATE * (sxx * syy * n):
+            return None
+        d = _det3(tuple((r[i], m[i][1], m[i][2]) for i in range(3))) / det
+        e = _det3(tuple((m[i][0], r[i], m[i][2]) for i in range(3))) / det
+        f = _det3(tuple((m[i][0], m[i][1], r[i]) for i in range(3))) / det
+        cx = -d / 2
+        cy = -e / 2
+        radius = max(cx * cx + cy * cy - f, 0.0) ** 0.5
+        return cx + self.x0, cy + self.y0, radius
+
+
+def _det3(m) -> float:
+    return (
+        m[0][0] * (m[1][1] * m[2][2] - m[1][2] * m[2][1])
+        - m[0][1] * (m[1][0] * m[2][2] - m[1][2] * m[2][0])
+        + m[0][2] * (m[1][0] * m[2][1] - m[1][1] * m[2][0])
+    )
+
+
+def _circle_distance(circle: tuple[float, float, float], x: float, y: float):
+    cx, cy, radius = circle
+    return abs(math.hypot(x - cx, y - cy) - radius)
+
+
+class Decimation(NamedTuple):
+    """Result of `decimate_polyline`."""
+
+    indices: list[int]  # indices of the kept points, first and last included
+    max_deviation: float  # largest distance of a dropped point from its chord
+
+
+def decimate_polyline(
+    points: VectorArray | Iterable[Vector], tolerance: float
+) -> Decimation:
+    """Drop points of a 3D polyline by Douglas-Peucker so that every dropped
+    point is within tolerance from the segment between the kept points
+    around it. The distances from each segment are computed in one
+    vectorized pass when NumPy is available."""
+    points = _as_array(points)
+    n = len(points)
+    if n <= 2:
+        return Decimation(list(range(n)), 0.0)
+    x, y, z = points.columns()
+    keep = [0, n - 1]
+    max_deviation = 0.0
+    stack = [(0, n - 1)]
+    while stack:
+        s, e = stack.pop()
+        if e - s < 2:
+            continue
+        i, distance = _farthest_from_segment(x, y, z, s, e)
+        if distance > tolerance:
+            keep.append(i)
+            stack.append((s, i))
+            stack.append((i, e))
+        else:
+            max_deviation = max(max_deviation, distance)
+    keep.sort()
+    return Decimation(keep, max_deviation)
+
+
+if np is not None:
+
+    def _farthest_from_segment(x: Column, y: Column, z: Column, s: int, e: int):
+        """Index in s+1..e-1 of the point farthest from segment s-e and its distance."""
+        dx, dy, dz = x[e] - x[s], y[e] - y[s], z[e] - z[s]
+        px, py, pz = x[s + 1 : e] - x[s], y[s + 1 : e] - y[s], z[s + 1 : e] - z[s]
+        length2 = dx * dx + dy * dy + dz * dz
+        if length2 > 0:
+            t = np.clip((px * dx + py * dy + pz * dz) / length2, 0.0, 1.0)
+            px, py, pz = px - t * dx, py - t * dy, pz - t * dz
+        d2 = px * px + py * py + pz * pz
+        i = int(d2.argmax())
+        return s + 1 + i, math.sqrt(d2[i])
+
+else:
+
+    def _farthest_from_segment(x: Column, y: Column, z: Column, s: int, e: int):
+        """Index in s+1..e-1 of the point farthest from segment s-e and its distance."""
+        x0, y0, z0 = x[s], y[s], z[s]
+        dx, dy, dz = x[e] - x0, y[e] - y0, z[e] - z0
+        length2 = dx * dx + dy * dy + dz * dz
+        farthest, max_d2 = s + 1, -1.0
+        for i in range(s + 1, e):
+            px, py, pz = x[i] - x0, y[i] - y0, z[i] - z0
+            if length2 > 0:
+                t = min(max((px * dx + py * dy + pz * dz) / length2, 0.0), 1.0)
+                px, py, pz = px - t * dx, py - t * dy, pz - t * dz
+            d2 = px * px + py * py + pz * pz
+            if d2 > max_d2:
+                farthest, max_d2 = i, d2
+        return farthest, math.sqrt(max_d2)
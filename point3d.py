@@ -1,9 +1,11 @@
 from __future__ import annotations
 import math
+from collections.abc import Iterable
 
 import adsk.core, adsk.fusion
 
 from . import vector
+from .vector_array import VectorArray
 
 
 def point3d(
@@ -20,6 +22,20 @@ def point3d(
     return adsk.core.Point3D.create(x, y, z)
 
 
+def point3d_list(
+    points: (
+        VectorArray | Iterable[adsk.core.Point3D | adsk.core.Vector3D | vector.Vector]
+    ),
+) -> list[adsk.core.Point3D]:
+    """Convert many points at once, same as `[point3d(p) for p in points]`."""
+    create = adsk.core.Point3D.create
+    if isinstance(points, VectorArray):
+        return list(
+            map(create, points.x.tolist(), points.y.tolist(), points.z.tolist())
+        )
+    return [create(p.x, p.y, p.z) for p in points]
+
+
 def point3d_add(
     p1: adsk.core.Point3D, p2: adsk.core.Point3D | vector.Vector | adsk.core.Vector3D
 ):
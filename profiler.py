@@ -0,0 +1,145 @@
+"""Call counts and wall times of event handlers.
+
+`Command` records into an EventProfiler when its `profile` attribute is set.
+The profiler can also be used alone to measure any function.
+"""
+
+from __future__ import annotations
+import cProfile
+import heapq
+import io
+import json
+import pstats
+import time
+from collections import deque
+from collections.abc import Callable
+from contextlib import contextmanager
+from typing import Any
+
+from .helpers import log
+
+
+class EventProfiler:
+    """Records the number of calls and the wall time of each named event.
+    The last `max_samples` times of each name are kept for the percentiles.
+    With capture_slowest > 0, calls made through `profile_call` run under
+    cProfile and the reports of the slowest ones are kept."""
+
+    def __init__(self, capture_slowest: int = 0, max_samples: int = 1000):
+        self.capture_slowest = capture_slowest
+        self.max_samples = max_samples
+        self.counts: dict[str, int] = {}
+        self.totals: dict[str, float] = {}
+        self.samples: dict[str, deque[float]] = {}
+        # min-heap of (seconds, sequence, name, report)
+        self.captures: list[tuple[float, int, str, str]] = []
+        self._sequence = 0
+
+    def record(self, name: str, seconds: float):
+        samples = self.samples.get(name)
+        if samples is None:
+            samples = self.samples[name] = deque(maxlen=self.max_samples)
+            self.counts[name] = 0
+            self.totals[name] = 0.0
+        samples.append(seconds)
+        self.counts[name] += 1
+        self.totals[name] += seconds
+
+    @contextmanager
+    def measure(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def wrap(self, name: str, fn: Callable[..., Any]) -> Callable[..., Any]:
+        """Return fn recording its calls as `name`."""
+
+        def measured(*args: Any, **kwargs: Any):
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                self.record(name, time.perf_counter() - start)
+
+        return measured
+
+    def profile_call(self, name: str, fn: Callable[..., Any], *args: Any) -> Any:
+        """Call fn(*args) under cProfile and keep the report
+        if it is among the `capture_slowest` slowest calls."""
+        if self.capture_slowest <= 0:
+            return fn(*args)
+        profile = cProfile.Profile()
+        start = time.perf_counter()
+        try:
+            return profile.runcall(fn, *args)
+        finally:
+            seconds = time.perf_counter() - start
+            if (
+                len(self.captures) < self.capture_slowest
+                or seconds > self.captures[0][0]
+            ):
+                stream = io.StringIO()
+                pstats.Stats(profile, stream=stream).sort_stats(
+                    "cumulative"
+                ).print_stats(20)
+                self._sequence += 1
+                capture = (seconds, self._sequence, name, stream.getvalue())
+                if len(self.captures) < self.capture_slowest:
+                    heapq.heappush(self.captures, capture)
+                else:
+                    heapq.heapreplace(self.captures, capture)
+
+    def summary(self) -> dict[str, dict[str, float]]:
+        """count, total, p50, p95 and max (in seconds) of each name."""
+        result: dict[str, dict[str, float]] = {}
+        for name, samples in self.samples.items():
+            ordered = sorted(samples)
+            result[name] = {
+                "count": self.counts[name],
+                "total": self.totals[name],
+                "p50": _percentile(ordered, 0.50),
+                "p95": _percentile(ordered, 0.95),
+                "max": ordered[-1],
+            }
+        return result
+
+    def slowest(self) -> list[tuple[float, str, str]]:
+        """(seconds, name, cProfile report) of the captured calls, slowest first."""
+        return [(s, n, r) for s, _, n, r in sorted(self.captures, reverse=True)]
+
+    def to_json(self, indent: int | None = 2) -> str:
+        return json.dumps(
+            {
+                "events": self.summary(),
+                "slowest": [
+                    {"seconds": s, "name": n, "report": r} for s, n, r in self.slowest()
+                ],
+            },
+            indent=indent,
+        )
+
+    def log(self):
+        """Write the summary to the TextCommands palette."""
+        lines = [f"{'event':<24}{'count':>8}{'p50 ms':>10}{'p95 ms':>10}{'max ms':>10}"]
+        for name, s in sorted(self.summary().items(), key=lambda i: -i[1]["total"]):
+            lines.append(
+                f"{name:<24}{s['count']:>8}{s['p50'] * 1e3:>10.1f}"
+                f"{s['p95'] * 1e3:>10.1f}{s['max'] * 1e3:>10.1f}"
+            )
+        for seconds, name, report in self.slowest():
+            lines.append(f"--- {name} {seconds * 1e3:.1f} ms")
+            lines.append(report)
+        log(lines)
+
+    def reset(self):
+        self.counts.clear()
+        self.totals.clear()
+        self.samples.clear()
+        self.captures.clear()
+
+
+def _percentile(ordered: list[float], q: float) -> float:
+    # nearest rank on sorted samples
+    return ordered[min(len(ordered) - 1, max(0, round(q * len(ordered)) - 1))]
@@ -1,21 +1,80 @@
-from collections.abc import Iterable
-from typing import cast
+import itertools
+import math
+import time
+from collections.abc import Callable, Iterable
+from contextlib import contextmanager
+from typing import Any, NamedTuple, cast
 
 import adsk.core, adsk.fusion
 
 from .helpers import collection
 from .vector import Vector
-from .point3d import point3d
+from .fitting import decimate_polyline
+from .vector_array import VectorArray, np
+from .point3d import point3d, point3d_list
+from .transform import Rotation2D
 
 
-def sketch_fix_all(sketch: adsk.fusion.Sketch):
-    """Fix all sketch contents."""
-    for p in sketch.sketchPoints:
-        p.isFixed = True
-    for c in sketch.sketchCurves:
-        c.isFixed = True
-    for t in sketch.sketchTexts:
-        t.isFixed = True
+class FixResult(NamedTuple):
+    """Counts of `sketch_fix_all`."""
+
+    fixed: int  # entities fixed by the call
+    already_fixed: int  # entities skipped as they were fixed before
+    filtered: int  # entities rejected by the predicate or bounding box
+
+
+def sketch_fix_all(
+    sketch: adsk.fusion.Sketch,
+    predicate: Callable[[adsk.fusion.SketchEntity], bool] | None = None,
+    bounding_box: tuple[Vector, Vector] | None = None,
+    progress: Callable[[int, int], Any] | None = None,
+    progress_interval: float = 0.5,
+) -> FixResult:
+    """Fix all sketch contents, i.e. points, curves and texts.
+    Entities already fixed are left untouched, and the sketch compute is
+    deferred until all are done. Only entities for which predicate returns
+    True and whose bounding box lies in bounding_box (min and max corners)
+    are fixed. progress(done, total) is called at most once per
+    progress_interval seconds and once at the end."""
+    collections = (sketch.sketchPoints, sketch.sketchCurves, sketch.sketchTexts)
+    total = sum(c.count for c in collections) if progress is not None else 0
+    fixed = already_fixed = filtered = done = 0
+    next_report = time.perf_counter() + progress_interval
+    with _deferred_compute(sketch):
+        for entities in collections:
+            for e in entities:
+                done += 1
+                if e.isFixed:
+                    already_fixed += 1
+                elif (predicate is None or predicate(e)) and (
+                    bounding_box is None or _in_box(e, *bounding_box)
+                ):
+                    e.isFixed = True
+                    fixed += 1
+                else:
+                    filtered += 1
+                if progress is not None and time.perf_counter() >= next_report:
+                    progress(done, total)
+                    next_report = time.perf_counter() + progress_interval
+    if progress is not None:
+        progress(done, total)
+    return FixResult(fixed, already_fixed, filtered)
+
+
+def _in_box(entity: adsk.fusion.SketchEntity, low: Vector, high: Vector) -> bool:
+    if isinstance(entity, adsk.fusion.SketchPoint):
+        a = b = entity.geometry
+    else:
+        box = entity.boundingBox
+        a, b = box.minPoint, box.maxPoint
+    return (
+        low.x <= a.x
+        and low.y <= a.y
+        and low.z <= a.z
+        and b.x <= high.x
+        and b.y <= high.y
+        and b.z <= high.z
+    )
 
 
 def sketch_line(
@@ -32,6 +91,87 @@ def sketch_line(
     return sketch.sketchCurves.sketchLines.addByTwoPoints(p1, p2)  # type: ignore[arg-type]
 
 
+def sketch_polyline(
+    sketch: adsk.fusion.Sketch,
+    points: VectorArray | Iterable[Vector],
+    closed: bool = False,
+    tolerance: float = 1e-6,
+    axis_constraints: bool = False,
+) -> list[adsk.fusion.SketchLine]:
+    """Add connected lines through points.
+    Points closer than tolerance are merged into one SketchPoint, which is
+    shared by all lines meeting there, so no coincident constraint is needed.
+    Zero-length segments are skipped. If closed, the last point is connected
+    to the first one. With axis_constraints, horizontal and vertical lines
+    are constrained so. Returns the lines created."""
+    unique, path = _merge_points(points, tolerance)
+    if closed and len(path) > 2 and path[-1] != path[0]:
+        path.append(path[0])
+    sketch_points: dict[int, adsk.fusion.SketchPoint] = {}
+    lines: list[adsk.fusion.SketchLine] = []
+    for i, j in zip(path, path[1:]):
+        line = sketch.sketchCurves.sketchLines.addByTwoPoints(
+            sketch_points.get(i) or point3d(unique[i]),  # type: ignore[arg-type]
+            sketch_points.get(j) or point3d(unique[j]),  # type: ignore[arg-type]
+        )
+        sketch_points.setdefault(i, line.startSketchPoint)
+        sketch_points.setdefault(j, line.endSketchPoint)
+        lines.append(line)
+        if axis_constraints:
+            d = unique[j] - unique[i]
+            if abs(d.y) <= tolerance and abs(d.z) <= tolerance:
+                sketch.geometricConstraints.addHorizontal(line)
+            elif abs(d.x) <= tolerance and abs(d.z) <= tolerance:
+                sketch.geometricConstraints.addVertical(line)
+    return lines
+
+
+def sketch_polygon(
+    sketch: adsk.fusion.Sketch,
+    points: VectorArray | Iterable[Vector],
+    tolerance: float = 1e-6,
+    axis_constraints: bool = False,
+) -> list[adsk.fusion.SketchLine]:
+    """Add a closed polygon; same as `sketch_polyline(..., closed=True)`."""
+    return sketch_polyline(sketch, points, True, tolerance, axis_constraints)
+
+
+def _merge_points(
+    points: VectorArray | Iterable[Vector], tolerance: float
+) -> tuple[list[Vector], list[int]]:
+    """Merge points within tolerance by a spatial hash of cell size tolerance.
+    Returns the merged points and, for each input point, the index of its
+    merged point, with consecutive repeats removed."""
+    if isinstance(points, VectorArray):
+        xyz = zip(*(map(float, c) for c in points.columns()))
+    else:
+        xyz = ((p.x, p.y, p.z) for p in points)
+    size = tolerance if tolerance > 0 else 1.0
+    cells: dict[tuple[int, int, int], list[int]] = {}
+    unique: list[Vector] = []
+    path: list[int] = []
+    for x, y, z in xyz:
+        cx, cy, cz = math.floor(x / size), math.floor(y / size), math.floor(z / size)
+        found = -1
+        for key in itertools.product(
+            (cx - 1, cx, cx + 1), (cy - 1, cy, cy + 1), (cz - 1, cz, cz + 1)
+        ):
+            for i in cells.get(key, ()):
+                u = unique[i]
+                if math.dist((x, y, z), (u.x, u.y, u.z)) <= tolerance:
+                    found = i
+                    break
+            if found >= 0:
+                break
+        if found < 0:
+            found = len(unique)
+            unique.append(Vector(x, y, z))
+            cells.setdefault((cx, cy, cz), []).append(found)
+        if not path or path[-1] != found:
+            path.append(found)
+    return unique, path
+
+
 def sketch_rectangle(
     sketch: adsk.fusion.Sketch,
     corner1: Vector | adsk.core.Point3D | adsk.fusion.SketchPoint,
@@ -155,6 +295,253 @@ def sketch_rectangle(
     return [l1, l2, l3, l4, f1, f2, f3, f4]
 
 
+@contextmanager
+def _deferred_compute(sketch: adsk.fusion.Sketch):
+    """Defer the sketch compute within the block and restore it after."""
+    deferred = sketch.isComputeDeferred
+    sketch.isComputeDeferred = True
+    try:
+        yield
+    finally:
+        sketch.isComputeDeferred = deferred
+
+
+def _rectangle_curves(
+    sketch: adsk.fusion.Sketch, corners: list[Vector], fillet: float | None
+) -> list:
+    """Unconstrained lines through 4 corners (lower-left first) and fillets
+    in the same order as `sketch_rectangle`."""
+    l1 = sketch_line(sketch, corners[0], corners[1])
+    l2 = sketch_line(sketch, l1.endSketchPoint, corners[2])
+    l3 = sketch_line(sketch, l2.endSketchPoint, corners[3])
+    l4 = sketch_line(sketch, l3.endSketchPoint, l1.startSketchPoint)
+    curves = [l1, l2, l3, l4]
+    if fillet is not None and fillet > 0:
+        curves += [
+            sketch_fillet(sketch, l1, l4, fillet),
+            sketch_fillet(sketch, l2, l1, fillet),
+            sketch_fillet(sketch, l3, l2, fillet),
+            sketch_fillet(sketch, l4, l3, fillet),
+        ]
+    return curves
+
+
+def _rectangle_corners(
+    corner1: Vector | adsk.core.Point3D, corner2: Vector | adsk.core.Point3D
+) -> list[Vector]:
+    return [
+        Vector(corner1.x, corner1.y),
+        Vector(corner2.x, corner1.y),
+        Vector(corner2.x, corner2.y),
+        Vector(corner1.x, corner2.y),
+    ]
+
+
+def _equal_to_master(sketch: adsk.fusion.Sketch, master: list, curves: list):
+    """Width, height and fillet radius of a copy equal to the master's."""
+    constraints = sketch.geometricConstraints
+    constraints.addEqual(master[0], curves[0])
+    constraints.addEqual(master[3], curves[3])
+    for f in curves[4:]:
+        constraints.addEqual(master[4], f)
+
+
+def _fix_curves(curves: list):
+    for c in curves:
+        c.isFixed = True
+
+
+def sketch_rectangle_array(
+    sketch: adsk.fusion.Sketch,
+    corner1: Vector | adsk.core.Point3D,
+    corner2: Vector | adsk.core.Point3D,
+    columns: int,
+    rows: int,
+    spacing: Vector,
+    reference: adsk.fusion.SketchPoint | None = None,
+    fillet: float | None = None,
+    square: bool = False,
+    fixed: bool = False,
+):
+    """Add a columns x rows grid of rectangles, `spacing` apart.
+    The first one is the master drawn by `sketch_rectangle`. Copies have
+    their width, height and fillets equal to the master's and are placed by
+    offset dimensions from the master, of which those after the first in
+    each direction are expressions of the first one. Changing the master's
+    dimensions or the first offsets thus updates the whole grid.
+    With fixed, all rectangles are added as fixed curves without any
+    constraint or dimension. The sketch compute is deferred meanwhile.
+    Returns the lists of curves of `sketch_rectangle`, row by row."""
+    corners = _rectangle_corners(corner1, corner2)
+    result: list[list] = []
+    with _deferred_compute(sketch):
+        if fixed:
+            master = _rectangle_curves(sketch, corners, fillet)
+            _fix_curves(master)
+        else:
+            master = sketch_rectangle(
+                sketch, corner1, corner2, reference, fillet, square
+            )
+        origin = master[0].startSketchPoint
+        offsets: dict[
+            adsk.fusion.DimensionOrientations, adsk.fusion.SketchDimension
+        ] = {}
+        for row in range(rows):
+            for column in range(columns):
+                if row == 0 and column == 0:
+                    result.append(master)
+                    continue
+                shift = Vector(spacing.x * column, spacing.y * row)
+                curves = _rectangle_curves(sketch, [c + shift for c in corners], fillet)
+                result.append(curves)
+                if fixed:
+                    _fix_curves(curves)
+                    continue
+                constraints = sketch.geometricConstraints
+                constraints.addHorizontal(curves[0])
+                constraints.addVertical(curves[1])
+                constraints.addHorizontal(curves[2])
+                constraints.addVertical(curves[3])
+                _equal_to_master(sketch, master, curves)
+                point = curves[0].startSketchPoint
+                if column == 0:
+                    constraints.addVerticalPoints(origin, point)
+                else:
+                    _offset_dimension(
+                        sketch,
+                        offsets,
+                        column,
+                        origin,
+                        point,
+                        DimensionOrientations.horizontal,
+                        point3d(
+                            corners[0].x + shift.x / 2, point.geometry.y - 0.2
+                        ),
+                    )
+                if row == 0:
+                    constraints.addHorizontalPoints(origin, point)
+                else:
+                    _offset_dimension(
+                        sketch,
+                        offsets,
+                        row,
+                        origin,
+                        point,
+                        DimensionOrientations.vertical,
+                        point3d(
+                            point.geometry.x - 0.2, corners[0].y + shift.y / 2
+                        ),
+                    )
+    return result
+
+
+def _offset_dimension(
+    sketch: adsk.fusion.Sketch,
+    offsets: dict[adsk.fusion.DimensionOrientations, adsk.fusion.SketchDimension],
+    k: int,
+    origin: adsk.fusion.SketchPoint,
+    point: adsk.fusion.SketchPoint,
+    orientation: adsk.fusion.DimensionOrientations,
+    text_point: adsk.core.Point3D,
+):
+    """Distance dimension of the k-th copy from the master. The first one in
+    each orientation keeps its value and the others are multiples of it."""
+    dimension = sketch.sketchDimensions.addDistanceDimension(
+        origin, point, orientation, text_point
+    )
+    first = offsets.setdefault(orientation, dimension)
+    if first is not dimension:
+        name = first.parameter.name
+        dimension.parameter.expression = name if k == 1 else f"{name} * {k}"
+
+
+def sketch_rectangle_polar_array(
+    sketch: adsk.fusion.Sketch,
+    corner1: Vector | adsk.core.Point3D,
+    corner2: Vector | adsk.core.Point3D,
+    count: int,
+    center: Vector | adsk.fusion.SketchPoint = Vector(0, 0),
+    angle: float | None = None,
+    reference: adsk.fusion.SketchPoint | None = None,
+    fillet: float | None = None,
+    square: bool = False,
+    fixed: bool = False,
+):
+    """Add count rectangles rotated around center by angle (in radians,
+    2 * pi / count by default) one after another. The first one is the
+    master drawn by `sketch_rectangle`. Copies have their width, height and
+    fillets equal to the master's and right angles at their corners. Their
+    lower-left corners are on a circle through the master's, by lines from
+    a point at center, and each copy is turned from the previous one by
+    angular dimensions equal to the first one. A SketchPoint center is used
+    as that point, constrained as the caller has it; otherwise a fixed
+    point is added at center. With fixed, all rectangles are added
+    as fixed curves without any constraint or dimension. The sketch compute
+    is deferred meanwhile. Returns the lists of curves in order."""
+    if angle is None:
+        angle = 2 * math.pi / count
+    pivot: adsk.fusion.SketchPoint | None = None
+    if isinstance(center, adsk.fusion.SketchPoint):
+        pivot, center = center, Vector(center.geometry.x, center.geometry.y)
+    corners = _rectangle_corners(corner1, corner2)
+    result: list[list] = []
+    with _deferred_compute(sketch):
+        if fixed:
+            master = _rectangle_curves(sketch, corners, fillet)
+            _fix_curves(master)
+        else:
+            master = sketch_rectangle(
+                sketch, corner1, corner2, reference, fillet, square
+            )
+        result.append(master)
+        lines = sketch.sketchCurves.sketchLines
+        if not fixed and count > 1:
+            if pivot is None:
+                pivot = sketch.sketchPoints.add(point3d(center))
+                # or the whole pattern could turn around a free point
+                pivot.isFixed = True
+            radius = lines.addByTwoPoints(pivot, master[0].startSketchPoint)
+            radius.isConstruction = True
+            previous, previous_radius = master, radius
+        first: adsk.fusion.SketchDimension | None = None
+        for k in range(1, count):
+            rotation = Rotation2D(angle * k, center)
+            curves = _rectangle_curves(sketch, [rotation(c) for c in corners], fillet)
+            result.append(curves)
+            if fixed:
+                _fix_curves(curves)
+                continue
+            constraints = sketch.geometricConstraints
+            constraints.addPerpendicular(curves[0], curves[1])
+            constraints.addPerpendicular(curves[1], curves[2])
+            constraints.addPerpendicular(curves[2], curves[3])
+            _equal_to_master(sketch, master, curves)
+            copy_radius = lines.addByTwoPoints(pivot, curves[0].startSketchPoint)
+            copy_radius.isConstruction = True
+            constraints.addEqual(radius, copy_radius)
+            if abs(math.sin(angle)) < 1e-9:
+                # angular dimensions are not defined between parallel lines
+                constraints.addParallel(previous[0], curves[0])
+                constraints.addCollinear(previous_radius, copy_radius)
+            else:
+                # each copy is turned from the previous one, as angular
+                # dimensions between lines do not exceed 180 degrees
+                half = Rotation2D(angle * (k - 0.5), center)
+                placement = sketch.sketchDimensions.addAngularDimension(
+                    previous_radius, copy_radius, point3d(half(corners[0]))
+                )
+                turn = sketch.sketchDimensions.addAngularDimension(
+                    previous[0], curves[0], point3d(half(corners[1]))
+                )
+                if first is None:
+                    first = placement
+                else:
+                    placement.parameter.expression = first.parameter.name
+                turn.parameter.expression = first.parameter.name
+            previous, previous_radius = curves, copy_radius
+    return result
+
+
 def sketch_fillet(
     sketch: adsk.fusion.Sketch,
     line1: (
@@ -195,13 +582,123 @@ def sketch_fillet(
 
 
 def sketch_fitted_splines(
-    sketch: adsk.fusion.Sketch, points: Iterable[Vector | adsk.core.Point3D | adsk.fusion.SketchPoint]
+    sketch: adsk.fusion.Sketch,
+    points: (
+        VectorArray | Iterable[Vector | adsk.core.Point3D | adsk.fusion.SketchPoint]
+    ),
+    tolerance: float | None = None,
 ):
-    """Add a fitted spline to the sketch using a list of points."""
-    converted = [point3d(p) if isinstance(p, Vector) else p for p in points]
+    """Add a fitted spline to the sketch using a list of points.
+    With tolerance, the points are first decimated as by
+    `sketch_decimated_spline`, which also reports the max deviation."""
+    if tolerance is not None:
+        return sketch_decimated_spline(sketch, points, tolerance).spline
+    if isinstance(points, VectorArray):
+        converted = point3d_list(points)
+    else:
+        create = adsk.core.Point3D.create
+        converted = [
+            create(p.x, p.y, p.z) if isinstance(p, Vector) else p for p in points
+        ]
     return sketch.sketchCurves.sketchFittedSplines.add(collection(converted))
 
 
+class DecimatedSpline(NamedTuple):
+    """Result of `sketch_decimated_spline`."""
+
+    spline: adsk.fusion.SketchFittedSpline
+    indices: list[int]  # indices of the input points passed to the spline
+    max_deviation: float  # largest distance of a dropped point from the kept ones
+
+
+def sketch_decimated_spline(
+    sketch: adsk.fusion.Sketch,
+    points: (
+        VectorArray | Iterable[Vector | adsk.core.Point3D | adsk.fusion.SketchPoint]
+    ),
+    tolerance: float,
+) -> DecimatedSpline:
+    """Add a fitted spline through points decimated by `decimate_polyline`,
+    so that the dropped ones are within tolerance from the kept polyline.
+    Point3D and SketchPoint inputs are decimated by their coordinates and
+    passed to the spline as they are."""
+    points, indices, deviation = _decimate(points, tolerance)
+    _check_spline_points(indices)
+    return DecimatedSpline(sketch_fitted_splines(sketch, points), indices, deviation)
+
+
+class SplineChain(NamedTuple):
+    """Result of `sketch_fitted_spline_chain`."""
+
+    splines: list[adsk.fusion.SketchFittedSpline]
+    indices: list[int]  # indices of the input points passed to the splines
+    max_deviation: float  # largest distance of a dropped point from the kept ones
+
+
+class _Decimated(NamedTuple):
+    points: VectorArray | list
+    indices: list[int]
+    max_deviation: float
+
+
+def _decimate(
+    points: (
+        VectorArray | Iterable[Vector | adsk.core.Point3D | adsk.fusion.SketchPoint]
+    ),
+    tolerance: float | None,
+) -> _Decimated:
+    if not isinstance(points, VectorArray):
+        points = list(points)
+    if tolerance is None:
+        return _Decimated(points, list(range(len(points))), 0.0)
+    coordinates = points
+    if not isinstance(points, VectorArray):
+        coordinates = [
+            p.geometry if isinstance(p, adsk.fusion.SketchPoint) else p
+            for p in points
+        ]
+    indices, deviation = decimate_polyline(coordinates, tolerance)
+    if isinstance(points, VectorArray) and np is not None:
+        return _Decimated(points[np.asarray(indices)], indices, deviation)
+    return _Decimated([points[i] for i in indices], indices, deviation)
+
+
+def sketch_fitted_spline_chain(
+    sketch: adsk.fusion.Sketch,
+    points: (
+        VectorArray | Iterable[Vector | adsk.core.Point3D | adsk.fusion.SketchPoint]
+    ),
+    tolerance: float | None = None,
+    max_points: int = 200,
+    tangent: bool = True,
+) -> SplineChain:
+    """Add fitted splines through points, decimated as `sketch_fitted_splines`
+    with tolerance, and split into splines of at most max_points points.
+    Each spline starts at the end SketchPoint of the previous one and,
+    with tangent, is constrained tangent to it."""
+    if max_points < 2:
+        raise ValueError("max_points must be 2 or more")
+    points, indices, deviation = _decimate(points, tolerance)
+    _check_spline_points(indices)
+    splines: list[adsk.fusion.SketchFittedSpline] = []
+    with _deferred_compute(sketch):
+        for start in range(0, max(len(indices) - 1, 1), max_points - 1):
+            chunk = points[start : start + max_points]
+            if splines:
+                end = splines[-1].endSketchPoint
+                chunk = [end, *list(chunk)[1:]]
+            spline = sketch_fitted_splines(sketch, chunk)
+            if splines and tangent:
+                sketch.geometricConstraints.addTangent(splines[-1], spline)
+            splines.append(spline)
+    return SplineChain(splines, indices, deviation)
+
+
+def _check_spline_points(indices: list[int]):
+    if len(indices) < 2:
+        raise ValueError("A fitted spline needs 2 or more points")
+
+
 def sketch_arc_center_start_end(
     sketch: adsk.fusion.Sketch,
     center: Vector | adsk.core.Point3D,
@@ -232,3 +729,257 @@ class DimensionOrientations:
         adsk.fusion.DimensionOrientations,
         adsk.fusion.DimensionOrientations.VerticalDimensionOrientation,
     )
+
+
+class SketchPending:
+    """An entity to be created when a SketchBatch is flushed. Attributes
+    can be referred to before that, e.g. `line.endSketchPoint`, and are
+    looked up on the created entity at flush. `result` is the entity."""
+
+    __slots__ = ("_resolve", "_value", "_done")
+
+    def __init__(self, resolve=None):
+        self._resolve = resolve
+        self._value = None
+        self._done = False
+
+    def __getattr__(self, name: str):
+        return SketchPending(lambda: getattr(self.result, name))
+
+    def _set(self, value):
+        self._value = value
+        self._done = True
+
+    @property
+    def result(self):
+        if not self._done:
+            if self._resolve is None:
+                raise RuntimeError("The sketch entity is not created yet.")
+            self._set(self._resolve())
+        return self._value
+
+
+class SketchBatch:
+    """
+    Queue sketch entities and add them at once with compute deferred.
+
+        with SketchBatch(sketch) as batch:
+            l1 = batch.line(Vector(0, 0), Vector(1, 0))
+            batch.horizontal(l1)
+            batch.line(l1.endSketchPoint, Vector(1, 1))
+
+    `sketch.isComputeDeferred` is set while in the block. On exit the queue
+    is flushed in the order of curves, fillets, geometric constraints and
+    then dimensions, so that the solver sees all the geometry before the
+    first dimension. Each method returns a SketchPending of the entity;
+    `created` lists the entities in the order of the calls.
+
+    Attributes of a SketchPending are looked up when their entity is
+    added, so a dimension to `line.startSketchPoint` measures the point
+    after the fillets trimmed the line. Pass the pending through `point`
+    to take it before the fillets.
+    """
+
+    _GEOMETRY, _FILLET, _CONSTRAINT, _DIMENSION = range(4)
+
+    def __init__(self, sketch: adsk.fusion.Sketch):
+        self.sketch = sketch
+        self.created: list = []
+        self._queue: list[tuple[int, int, SketchPending, object, tuple, bool]] = []
+        self._deferred = False
+
+    def __enter__(self):
+        self._deferred = self.sketch.isComputeDeferred
+        self.sketch.isComputeDeferred = True
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            if exc_type is None:
+                self.flush()
+        finally:
+            self.sketch.isComputeDeferred = self._deferred
+
+    def _add(self, phase: int, fn, *args, created: bool = True) -> SketchPending:
+        pending = SketchPending()
+        self._queue.append((phase, len(self._queue), pending, fn, args, created))
+        return pending
+
+    def flush(self) -> list:
+        """Add the queued entities and return them in the order of the calls."""
+        queue, self._queue = self._queue, []
+        for _, _, pending, fn, args, _ in sorted(queue, key=lambda q: q[:2]):
+            pending._set(fn(*(_resolve(a) for a in args)))
+        # in the order of the calls
+        results = [pending.result for _, _, pending, _, _, created in queue if created]
+        self.created.extend(results)
+        return results
+
+    def point(self, point: SketchPending) -> SketchPending:
+        """The SketchPoint of point as it is with the curves added,
+        before fillets replace the corner points of their lines."""
+        return self._add(self._GEOMETRY, lambda p: p, point, created=False)
+
+    def line(self, p1, p2):
+        return self._add(
+            self._GEOMETRY, self.sketch.sketchCurves.sketchLines.addByTwoPoints, p1, p2
+        )
+
+    def arc_center_start_end(self, center, start, end):
+        return self._add(
+            self._GEOMETRY,
+            self.sketch.sketchCurves.sketchArcs.addByCenterStartEnd,
+            center,
+            start,
+            end,
+        )
+
+    def fitted_spline(self, points: Iterable):
+        return self._add(
+            self._GEOMETRY,
+            lambda *p: sketch_fitted_splines(self.sketch, p),
+            *points,
+        )
+
+    def polyline(
+        self,
+        points: VectorArray | Iterable[Vector],
+        closed: bool = False,
+        tolerance: float = 1e-6,
+    ) -> SketchPending:
+        """Queue the lines of `sketch_polyline`, sharing merged points.
+        The result is the list of the lines."""
+        unique, path = _merge_points(points, tolerance)
+        if closed and len(path) > 2 and path[-1] != path[0]:
+            path.append(path[0])
+        ends: dict[int, SketchPending | Vector] = {}
+        lines = []
+        for i, j in zip(path, path[1:]):
+            line = self.line(ends.get(i, unique[i]), ends.get(j, unique[j]))
+            ends.setdefault(i, line.startSketchPoint)
+            ends.setdefault(j, line.endSketchPoint)
+            lines.append(line)
+        return SketchPending(lambda: [line.result for line in lines])
+
+    def polygon(
+        self, points: VectorArray | Iterable[Vector], tolerance: float = 1e-6
+    ) -> SketchPending:
+        return self.polyline(points, True, tolerance)
+
+    def fillet(self, line1, line2, radius: float):
+        return self._add(
+            self._FILLET,
+            lambda l1, l2: sketch_fillet(self.sketch, l1, l2, radius),
+            line1,
+            line2,
+        )
+
+    def constraint(self, method: str, *args):
+        """Queue `sketch.geometricConstraints.<method>(*args)`, e.g. "addParallel"."""
+        return self._add(
+            self._CONSTRAINT, getattr(self.sketch.geometricConstraints, method), *args
+        )
+
+    def horizontal(self, line):
+        return self.constraint("addHorizontal", line)
+
+    def vertical(self, line):
+        return self.constraint("addVertical", line)
+
+    def equal(self, curve1, curve2):
+        return self.constraint("addEqual", curve1, curve2)
+
+    def coincident(self, point, entity):
+        """Coincident constraint, which is skipped if Fusion 360 rejects it."""
+
+        def add(p, e):
+            try:
+                return self.sketch.geometricConstraints.addCoincident(p, e)
+            except RuntimeError:
+                return None
+
+        return self._add(self._CONSTRAINT, add, point, entity)
+
+    def dimension(self, method: str, *args):
+        """Queue `sketch.sketchDimensions.<method>(*args)`, e.g. "addAngularDimension"."""
+        return self._add(
+            self._DIMENSION, getattr(self.sketch.sketchDimensions, method), *args
+        )
+
+    def distance_dimension(
+        self,
+        p1,
+        p2,
+        orientation: adsk.fusion.DimensionOrientations,
+        text_point: Vector,
+    ):
+        return self.dimension("addDistanceDimension", p1, p2, orientation, text_point)
+
+    def radial_dimension(self, arc, text_point: Vector):
+        return self.dimension("addRadialDimension", arc, text_point)
+
+    def rectangle(
+        self,
+        corner1: Vector | adsk.core.Point3D | adsk.fusion.SketchPoint,
+        corner2: Vector | adsk.core.Point3D | adsk.fusion.SketchPoint,
+        fillet: float | None = None,
+        square: bool = False,
+    ) -> SketchPending:
+        """Queue the same entities as `sketch_rectangle` without reference.
+        The result is the list of the curves in the same order."""
+        p1 = (
+            corner1.geometry
+            if isinstance(corner1, adsk.fusion.SketchPoint)
+            else corner1
+        )
+        p2 = (
+            corner2.geometry
+            if isinstance(corner2, adsk.fusion.SketchPoint)
+            else corner2
+        )
+        l1 = self.line(corner1, Vector(p2.x, p1.y))
+        l2 = self.line(l1.endSketchPoint, corner2)
+        l3 = self.line(l2.endSketchPoint, Vector(p1.x, p2.y))
+        l4 = self.line(l3.endSketchPoint, l1.startSketchPoint)
+        curves = [l1, l2, l3, l4]
+        # corners as sketch_rectangle dimensions them, before filleting
+        lower_left = self.point(l1.startSketchPoint)
+        self.horizontal(l1)
+        self.vertical(l2)
+        self.horizontal(l3)
+        self.vertical(l4)
+        self.distance_dimension(
+            lower_left,
+            self.point(l1.endSketchPoint),
+            DimensionOrientations.horizontal,
+            Vector((p1.x + p2.x) / 2, p1.y - 0.2),
+        )
+        if not square:
+            self.distance_dimension(
+                self.point(l4.startSketchPoint),
+                lower_left,
+                DimensionOrientations.vertical,
+                Vector(p1.x - 0.2, (p1.y + p2.y) / 2),
+            )
+        if fillet is not None and fillet > 0:
+            fillets = [
+                self.fillet(l1, l4, fillet),
+                self.fillet(l2, l1, fillet),
+                self.fillet(l3, l2, fillet),
+                self.fillet(l4, l3, fillet),
+            ]
+            self.radial_dimension(fillets[0], Vector(-2 * fillet, -2 * fillet, 0))
+            for f, g in zip(fillets, fillets[1:]):
+                self.equal(f, g)
+            curves += fillets
+        if square:
+            self.equal(l1, l4)
+        return SketchPending(lambda: [c.result for c in curves])
+
+
+def _resolve(arg):
+    if isinstance(arg, SketchPending):
+        arg = arg.result
+    if isinstance(arg, Vector):
+        return point3d(arg)
+    return arg
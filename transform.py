@@ -0,0 +1,339 @@
+"""Lightweight 4x4 affine transform computed in Python.
+
+Helpers in `matrix.py` build `adsk.core.Matrix3D` objects and compose them
+by API calls. `Transform` does the same math locally on a tuple of 16 floats
+in the row-major layout of `Matrix3D.asArray()`, and converts to a Matrix3D
+only when a feature needs one. It does not require Fusion 360 except for
+`to_matrix3d` and `from_matrix3d`.
+"""
+
+from __future__ import annotations
+import math
+from collections.abc import Iterable
+from typing import TYPE_CHECKING
+
+from .vector import Vector, _vector
+from .vector_array import VectorArray, _apply, _full, np
+
+if TYPE_CHECKING:
+    import adsk.core
+
+_IDENTITY = (
+    1.0, 0.0, 0.0, 0.0,
+    0.0, 1.0, 0.0, 0.0,
+    0.0, 0.0, 1.0, 0.0,
+    0.0, 0.0, 0.0, 1.0,
+)  # fmt: skip
+
+
+class Transform:
+    """Affine transform `p' = M p` with the matrix stored row by row."""
+
+    __slots__ = ("m",)
+
+    def __init__(self, values: Iterable[float] | None = None):
+        self.m: tuple[float, ...] = (
+            _IDENTITY if values is None else tuple(map(float, values))
+        )
+        if len(self.m) != 16:
+            raise ValueError("Transform requires 16 values")
+
+    @classmethod
+    def translation(cls, x: Vector | float = 0.0, y: float = 0.0, z: float = 0.0):
+        if isinstance(x, Vector):
+            x, y, z = x.x, x.y, x.z
+        return cls((1, 0, 0, x, 0, 1, 0, y, 0, 0, 1, z, 0, 0, 0, 1))
+
+    @classmethod
+    def scale(cls, x=1.0, y=1.0, z=1.0, center: Vector | None = None):
+        result = cls((x, 0, 0, 0, 0, y, 0, 0, 0, 0, z, 0, 0, 0, 0, 1))
+        if center is None:
+            return result
+        return result._about(center)
+
+    @classmethod
+    def flip_axes(cls, x: bool = False, y: bool = False, z: bool = False):
+        return cls.scale(-1 if x else 1, -1 if y else 1, -1 if z else 1)
+
+    @classmethod
+    def rotation(
+        cls,
+        angle: float,
+        axis: Vector = Vector(0, 0, 1),
+        center: Vector | None = None,
+    ):
+        """Rotation by angle (in radians) around axis through center,
+        same as `Matrix3D.setToRotation`."""
+        ax, ay, az = axis.normalize()
+        c = math.cos(angle)
+        s = math.sin(angle)
+        t = 1 - c
+        result = cls(
+            (
+                t * ax * ax + c, t * ax * ay - s * az, t * ax * az + s * ay, 0,
+                t * ax * ay + s * az, t * ay * ay + c, t * ay * az - s * ax, 0,
+                t * ax * az - s * ay, t * ay * az + s * ax, t * az * az + c, 0,
+                0, 0, 0, 1,
+            )
+        )  # fmt: skip
+        if center is None:
+            return result
+        return result._about(center)
+
+    @classmethod
+    def from_matrix3d(cls, matrix: adsk.core.Matrix3D):
+        return cls(matrix.asArray())
+
+    def to_matrix3d(self) -> adsk.core.Matrix3D:
+        """Create an `adsk.core.Matrix3D` with the same values."""
+        import adsk.core  # pylint: disable=import-outside-toplevel
+
+        result = adsk.core.Matrix3D.create()
+        result.setWithArray(list(self.m))
+        return result
+
+    def _about(self, center: Vector):
+        """The same linear map with `center` as its fixed point."""
+        return (
+            Transform.translation(-center)
+            .then(self)
+            .then(Transform.translation(center))
+        )
+
+    def __matmul__(self, other: Transform):
+        """Matrix product `self * other`, i.e. `other` is applied first."""
+        a = self.m
+        b = other.m
+        return Transform(
+            a[i4] * b[j]
+            + a[i4 + 1] * b[j + 4]
+            + a[i4 + 2] * b[j + 8]
+            + a[i4 + 3] * b[j + 12]
+            for i4 in (0, 4, 8, 12)
+            for j in range(4)
+        )
+
+    def then(self, other: Transform):
+        """Apply `other` after self; same as `Matrix3D.transformBy(other)`."""
+        return other @ self
+
+    @classmethod
+    def chain(cls, transforms: Iterable[Transform]):
+        """Compose transforms applied in the given order."""
+        result = cls()
+        for t in transforms:
+            result = t @ result
+        return result
+
+    def inverse(self):
+        """Inverse of an affine transform."""
+        a, b, c, tx, d, e, f, ty, g, h, i, tz = self.m[:12]
+        co_a = e * i - f * h
+        co_d = c * h - b * i
+        co_g = b * f - c * e
+        det = a * co_a + d * co_d + g * co_g
+        if det == 0:
+            raise ZeroDivisionError("Transform is not invertible")
+        r = 1 / det
+        m = (
+            co_a * r, co_d * r, co_g * r,
+            (f * g - d * i) * r, (a * i - c * g) * r, (c * d - a * f) * r,
+            (d * h - e * g) * r, (b * g - a * h) * r, (a * e - b * d) * r,
+        )  # fmt: skip
+        return Transform(
+            (
+                m[0], m[1], m[2], -(m[0] * tx + m[1] * ty + m[2] * tz),
+                m[3], m[4], m[5], -(m[3] * tx + m[4] * ty + m[5] * tz),
+                m[6], m[7], m[8], -(m[6] * tx + m[7] * ty + m[8] * tz),
+                0.0, 0.0, 0.0, 1.0,
+            )
+        )  # fmt: skip
+
+    def apply(self, p: Vector | VectorArray):
+        """Transform a point or all points of a VectorArray."""
+        m = self.m
+        if isinstance(p, VectorArray):
+            return VectorArray(
+                _apply(
+                    lambda x, y, z: m[0] * x + m[1] * y + m[2] * z + m[3], *p.columns()
+                ),
+                _apply(
+                    lambda x, y, z: m[4] * x + m[5] * y + m[6] * z + m[7], *p.columns()
+                ),
+                _apply(
+                    lambda x, y, z: m[8] * x + m[9] * y + m[10] * z + m[11],
+                    *p.columns(),
+                ),
+            )
+        x, y, z = p.x, p.y, p.z
+        return _vector(
+            m[0] * x + m[1] * y + m[2] * z + m[3],
+            m[4] * x + m[5] * y + m[6] * z + m[7],
+            m[8] * x + m[9] * y + m[10] * z + m[11],
+        )
+
+    def apply_vector(self, v: Vector | VectorArray):
+        """Transform a direction (the translation is not applied)."""
+        m = self.m
+        if isinstance(v, VectorArray):
+            return VectorArray(
+                _apply(lambda x, y, z: m[0] * x + m[1] * y + m[2] * z, *v.columns()),
+                _apply(lambda x, y, z: m[4] * x + m[5] * y + m[6] * z, *v.columns()),
+                _apply(lambda x, y, z: m[8] * x + m[9] * y + m[10] * z, *v.columns()),
+            )
+        x, y, z = v.x, v.y, v.z
+        return _vector(
+            m[0] * x + m[1] * y + m[2] * z,
+            m[4] * x + m[5] * y + m[6] * z,
+            m[8] * x + m[9] * y + m[10] * z,
+        )
+
+    @property
+    def translation_vector(self):
+        return _vector(self.m[3], self.m[7], self.m[11])
+
+    def is_equal(self, other: Transform, tolerance: float = 1e-9):
+        return all(abs(a - b) <= tolerance for a, b in zip(self.m, other.m))
+
+    def is_identity(self, tolerance: float = 1e-9):
+        return self.is_equal(_IDENTITY_TRANSFORM, tolerance)
+
+    def __eq__(self, other: object):
+        return isinstance(other, Transform) and self.m == other.m
+
+    def __hash__(self):
+        return hash(self.m)
+
+    def __repr__(self):
+        rows = (self.m[i : i + 4] for i in range(0, 16, 4))
+        return f"Transform({', '.join(str(list(r)) for r in rows)})"
+
+
+_IDENTITY_TRANSFORM = Transform()
+
+
+class Rotation2D:
+    """Rotation around z-axis by a fixed angle with cos/sin computed once.
+    `Rotation2D(angle, origin).apply(v)` equals `v.rotate(angle, origin)`,
+    including that the z component is set to 0 (or `origin.z`)."""
+
+    __slots__ = ("angle", "cos", "sin", "ox", "oy", "oz")
+
+    def __init__(self, angle: float, origin: Vector | None = None):
+        self.angle = angle
+        self.cos = math.cos(angle)
+        self.sin = math.sin(angle)
+        self.ox, self.oy, self.oz = (
+            (0.0, 0.0, 0.0) if origin is None else (origin.x, origin.y, origin.z)
+        )
+
+    @property
+    def origin(self) -> Vector:
+        return _vector(self.ox, self.oy, self.oz)
+
+    def apply(self, p: Vector | VectorArray):
+        """Rotate a point or all points of a VectorArray."""
+        c, s, ox, oy = self.cos, self.sin, self.ox, self.oy
+        if isinstance(p, VectorArray):
+            return VectorArray(
+                _apply(lambda x, y: (x - ox) * c - (y - oy) * s + ox, p.x, p.y),
+                _apply(lambda x, y: (x - ox) * s + (y - oy) * c + oy, p.x, p.y),
+                _full(len(p), self.oz),
+            )
+        x = p.x - ox
+        y = p.y - oy
+        return _vector(x * c - y * s + ox, x * s + y * c + oy, self.oz)
+
+    __call__ = apply
+
+    def polar_array(self, points: Vector | VectorArray | Iterable[Vector], count: int):
+        """Copies of points rotated by 0, angle, 2 * angle, ... (count copies)
+        as one VectorArray; copy k occupies rows k * len(points) and after."""
+        points = _to_array(points)
+        angles = [self.angle * k for k in range(count)]
+        if np is None:
+            origin = self.origin
+            return VectorArray.concat(Rotation2D(a, origin)(points) for a in angles)
+        c = np.cos(angles)[:, None]
+        s = np.sin(angles)[:, None]
+        x = points.x - self.ox
+        y = points.y - self.oy
+        return VectorArray(
+            (x * c - y * s + self.ox).ravel(),
+            (x * s + y * c + self.oy).ravel(),
+            np.full(count * len(points), self.oz),
+        )
+
+
+class AxisRotation:
+    """Rotation around an axis by a fixed angle with the axis normalized
+    and cos/sin computed once. Without center, `apply(v)` equals
+    `v.rotate_axis(axis, angle)`; with center, the axis passes through it."""
+
+    __slots__ = ("axis", "ax", "ay", "az", "angle", "cos", "sin", "center")
+
+    def __init__(self, axis: Vector, angle: float, center: Vector | None = None):
+        self.axis = axis.normalize()
+        self.ax, self.ay, self.az = self.axis.x, self.axis.y, self.axis.z
+        self.angle = angle
+        self.cos = math.cos(angle)
+        self.sin = math.sin(angle)
+        self.center = center
+
+    def apply(self, p: Vector | VectorArray):
+        """Rotate a point or all points of a VectorArray."""
+        if isinstance(p, VectorArray):
+            return self._apply_array(p)
+        c, s, o = self.cos, self.sin, self.center
+        ax, ay, az = self.ax, self.ay, self.az
+        x, y, z = (p.x, p.y, p.z) if o is None else (p.x - o.x, p.y - o.y, p.z - o.z)
+        k = (x * ax + y * ay + z * az) * (1 - c)
+        # same formula as Vector.rotate_axis
+        x, y, z = (
+            x * c + (y * az - z * ay) * s + ax * k,
+            y * c + (z * ax - x * az) * s + ay * k,
+            z * c + (x * ay - y * ax) * s + az * k,
+        )
+        return _vector(x, y, z) if o is None else _vector(x + o.x, y + o.y, z + o.z)
+
+    __call__ = apply
+
+    def _apply_array(self, points: VectorArray) -> VectorArray:
+        c, s, ax, ay, az = self.cos, self.sin, self.ax, self.ay, self.az
+        d = points if self.center is None else points - self.center
+        k = d.dot(self.axis)
+        r = d * c + d.cross(self.axis) * s
+        r.x = _apply(lambda x, k: x + k * (ax * (1 - c)), r.x, k)
+        r.y = _apply(lambda y, k: y + k * (ay * (1 - c)), r.y, k)
+        r.z = _apply(lambda z, k: z + k * (az * (1 - c)), r.z, k)
+        return r if self.center is None else r + self.center
+
+    def polar_array(self, points: Vector | VectorArray | Iterable[Vector], count: int):
+        """Copies of points rotated by 0, angle, 2 * angle, ... (count copies)
+        as one VectorArray; copy k occupies rows k * len(points) and after."""
+        points = _to_array(points)
+        angles = [self.angle * k for k in range(count)]
+        if np is None:
+            return VectorArray.concat(
+                AxisRotation(self.axis, a, self.center)(points) for a in angles
+            )
+        c = np.cos(angles)[:, None]
+        s = np.sin(angles)[:, None]
+        d = points if self.center is None else points - self.center
+        cross = d.cross(self.axis)
+        k = d.dot(self.axis)
+        center = self.center if self.center is not None else _vector(0.0, 0.0, 0.0)
+        return VectorArray(
+            *(
+                (p * c + q * s + a * k * (1 - c) + o).ravel()
+                for p, q, a, o in zip(d.columns(), cross.columns(), self.axis, center)
+            )
+        )
+
+
+def _to_array(points: Vector | VectorArray | Iterable[Vector]) -> VectorArray:
+    if isinstance(points, VectorArray):
+        return points
+    if isinstance(points, Vector):
+        return VectorArray.from_vectors([points])
+    return VectorArray.from_vectors(points)
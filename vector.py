@@ -1,48 +1,60 @@
 from __future__ import annotations
 import math
-import adsk.core
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:  # adsk is only used for type hints here
+    import adsk.core
 
 
 class Vector:
+    # x, y and z are stored in slots to keep the instances small and fast
+    # to create; arithmetic results are created by `_vector` which bypasses
+    # the type checks in `__init__`.
+    __slots__ = ("x", "y", "z")
+
+    x: float
+    y: float
+    z: float
+
     def __init__(
         self,
         x: str | float | adsk.core.Vector3D | adsk.core.Point3D | Vector = 0.0,
         y: float = 0.0,
         z: float = 0.0,
     ):
+        if isinstance(x, (float, int)):
+            self.x = x
+            self.y = y
+            self.z = z
+            return
         if isinstance(x, str):
             strs = x.removeprefix("(").removesuffix(")").split(",")
             self.x = float(strs[0])
             self.y = float(strs[1])
             self.z = float(strs[2])
             return
-        if isinstance(x, float) or isinstance(x, int):
-            self.x = x
-            self.y = y
-            self.z = z
-            return
         self.x = x.x
         self.y = x.y
         self.z = x.z
 
     @classmethod
     def polar(cls, radius: float, t: float):
-        return Vector(radius * math.cos(t), radius * math.sin(t))
+        return _vector(radius * math.cos(t), radius * math.sin(t), 0.0)
 
     def __add__(self, other: Vector):
-        return Vector(self.x + other.x, self.y + other.y, self.z + other.z)
+        return _vector(self.x + other.x, self.y + other.y, self.z + other.z)
 
     def __sub__(self, other: Vector):
-        return Vector(self.x - other.x, self.y - other.y, self.z - other.z)
+        return _vector(self.x - other.x, self.y - other.y, self.z - other.z)
 
     def __mul__(self, scalar: float):
-        return Vector(self.x * scalar, self.y * scalar, self.z * scalar)
+        return _vector(self.x * scalar, self.y * scalar, self.z * scalar)
 
     def __rmul__(self, scalar: float):
-        return Vector(self.x * scalar, self.y * scalar, self.z * scalar)
+        return _vector(self.x * scalar, self.y * scalar, self.z * scalar)
 
     def __truediv__(self, scalar: float):
-        return Vector(self.x / scalar, self.y / scalar, self.z / scalar)
+        return _vector(self.x / scalar, self.y / scalar, self.z / scalar)
 
     def __repr__(self):
         return f"Vector({self.x}, {self.y}, {self.z})"
@@ -62,7 +74,7 @@ class Vector:
         return not self == other
 
     def __neg__(self):
-        return Vector(-self.x, -self.y, -self.z)
+        return _vector(-self.x, -self.y, -self.z)
 
     def __abs__(self) -> float:
         return (self.x**2 + self.y**2 + self.z**2) ** 0.5
@@ -100,17 +112,17 @@ class Vector:
         return 3
 
     def __copy__(self):
-        return Vector(self.x, self.y, self.z)
+        return _vector(self.x, self.y, self.z)
 
     def __deepcopy__(self, memo):
-        return Vector(self.x, self.y, self.z)
+        return _vector(self.x, self.y, self.z)
 
     def __format__(self, format_spec):
         components = (format(c, format_spec) for c in self)
         return f'({", ".join(components)})'
 
     def __round__(self, n: int = 0):
-        return Vector(round(self.x, n), round(self.y, n), round(self.z, n))
+        return _vector(round(self.x, n), round(self.y, n), round(self.z, n))
 
     def norm(self):
         """
@@ -183,7 +195,7 @@ class Vector:
         Returns:
             Vector: The cross product.
         """
-        return Vector(
+        return _vector(
             self.y * other.z - self.z * other.y,
             self.z * other.x - self.x * other.z,
             self.x * other.y - self.y * other.x,
@@ -199,7 +211,8 @@ class Vector:
         Returns:
         Vector: A new vector with the same direction as the original but with the specified size.
         """
-        return size * self / abs(self)
+        scale = size / abs(self)
+        return _vector(self.x * scale, self.y * scale, self.z * scale)
 
     def flip_x(self):
         """
@@ -208,7 +221,7 @@ class Vector:
         Returns:
             Vector: A new vector with the X component negated.
         """
-        return Vector(-self.x, self.y, self.z)
+        return _vector(-self.x, self.y, self.z)
 
     def flip_y(self):
         """
@@ -217,7 +230,7 @@ class Vector:
         Returns:
             Vector: A new vector with the y-coordinate negated.
         """
-        return Vector(self.x, -self.y, self.z)
+        return _vector(self.x, -self.y, self.z)
 
     def flip_z(self):
         """
@@ -226,7 +239,7 @@ class Vector:
         Returns:
             Vector: A new vector with the z-coordinate negated.
         """
-        return Vector(self.x, self.y, -self.z)
+        return _vector(self.x, self.y, -self.z)
 
     def rotate(self, angle: float, origin: Vector | None = None) -> Vector:
         """
@@ -240,12 +253,19 @@ class Vector:
             Vector: A new vector that is the result of rotating
             the original vector by the given angle.
         """
-        if origin is not None:
-            return (self - origin).rotate(angle) + origin
-
-        return Vector(
-            self.x * math.cos(angle) - self.y * math.sin(angle),
-            self.x * math.sin(angle) + self.y * math.cos(angle),
+        cos_a = math.cos(angle)
+        sin_a = math.sin(angle)
+        if origin is None:
+            return _vector(
+                self.x * cos_a - self.y * sin_a, self.x * sin_a + self.y * cos_a, 0.0
+            )
+
+        x = self.x - origin.x
+        y = self.y - origin.y
+        return _vector(
+            x * cos_a - y * sin_a + origin.x,
+            x * sin_a + y * cos_a + origin.y,
+            origin.z,
         )
 
     def add_rotated(self, angle: float, other: Vector):
@@ -263,12 +283,19 @@ class Vector:
 
     def rotate_axis(self, axis: Vector, angle: float):
         """rotate v around axis by angle (in radians)"""
-        axis = axis.normalize()
+        length = abs(axis)
+        ax = axis.x / length
+        ay = axis.y / length
+        az = axis.z / length
         cos_a = math.cos(angle)
         sin_a = math.sin(angle)
-        dot = self.dot(axis)
-        cross = self.cross(axis)
-        return self * cos_a + cross * sin_a + axis * dot * (1 - cos_a)
+        x, y, z = self.x, self.y, self.z
+        k = (x * ax + y * ay + z * az) * (1 - cos_a)
+        return _vector(
+            x * cos_a + (y * az - z * ay) * sin_a + ax * k,
+            y * cos_a + (z * ax - x * az) * sin_a + ay * k,
+            z * cos_a + (x * ay - y * ax) * sin_a + az * k,
+        )
 
     def to_polar(self):
         """
@@ -312,6 +339,19 @@ class Vector:
         return d - d.dot(normal) * normal + origin
 
 
+_new_vector = object.__new__
+
+
+def _vector(x: float, y: float, z: float) -> Vector:
+    """Create a Vector from three floats without the type checks of
+    `Vector.__init__`. Used internally by the arithmetic operators."""
+    v = _new_vector(Vector)
+    v.x = x
+    v.y = y
+    v.z = z
+    return v
+
+
 def vec(x: float | adsk.core.Point3D | adsk.core.Vector3D = 0.0, y=0.0, z=0.0):
     """
     Create a 3D vector with the given x, y and z coordinates.
@@ -424,9 +464,12 @@ def fit3d_by_plane(points: list[Vector]):
 
 
 def radius_from_3points(p1: Vector, p2: Vector, p3: Vector) -> float:
+    # the area by cross product is stable for thin triangles, unlike Heron's
+    # formula; collinear points give math.inf
     a = (p1 - p2).norm()
     b = (p2 - p3).norm()
     c = (p3 - p1).norm()
-    s = (a + b + c) / 2
-    area = math.sqrt(s * (s - a) * (s - b) * (s - c))
+    area = abs((p2 - p1).cross(p3 - p1)) / 2
+    if area == 0:
+        return math.inf
     return (a * b * c) / (4 * area)
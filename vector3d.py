@@ -1,9 +1,11 @@
 from __future__ import annotations
 import math
+from collections.abc import Iterable
 
 import adsk.core, adsk.fusion
 
 from . import vector
+from .vector_array import VectorArray
 
 
 def vector3d(
@@ -20,6 +22,20 @@ def vector3d(
     return adsk.core.Vector3D.create(x, y, z)
 
 
+def vector3d_list(
+    vectors: (
+        VectorArray | Iterable[adsk.core.Point3D | adsk.core.Vector3D | vector.Vector]
+    ),
+) -> list[adsk.core.Vector3D]:
+    """Convert many vectors at once, same as `[vector3d(v) for v in vectors]`."""
+    create = adsk.core.Vector3D.create
+    if isinstance(vectors, VectorArray):
+        return list(
+            map(create, vectors.x.tolist(), vectors.y.tolist(), vectors.z.tolist())
+        )
+    return [create(v.x, v.y, v.z) for v in vectors]
+
+
 def vector3d_polar(r: float, t: float = 0):
     return vector3d(r * math.cos(t), r * math.sin(t))
 
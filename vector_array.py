@@ -0,0 +1,276 @@
+"""Array of 3D vectors for batched point-cloud math.
+
+The coordinates are kept as three columns x, y and z. When NumPy is
+importable the columns are float64 ndarrays and each operation is a single
+vectorized call. Otherwise they are `array('d')` and the same expressions
+are mapped over the elements, so the results are identical either way.
+"""
+
+from __future__ import annotations
+import math
+import operator
+from array import array
+from collections.abc import Callable, Iterable, Iterator
+from itertools import repeat
+from numbers import Integral
+from typing import Any
+
+from .vector import Vector, _vector
+
+try:
+    import numpy as np
+except ImportError:  # numpy is not bundled with Fusion 360
+    np = None
+
+# a column of floats, numpy.ndarray or array('d')
+Column = Any
+
+
+if np is not None:
+
+    def _column(values: Iterable[float]) -> Column:
+        return np.asarray(values, dtype=float)
+
+    def _full(n: int, value: float) -> Column:
+        return np.full(n, value, dtype=float)
+
+    def _sum(column: Column) -> float:
+        return float(column.sum())
+
+    def _apply(fn: Callable[..., Any], *args: Column | float) -> Column:
+        # numpy broadcasts scalars and evaluates the expression at once
+        return fn(*args)
+
+else:
+
+    def _column(values: Iterable[float]) -> Column:
+        return values if isinstance(values, array) else array("d", values)
+
+    def _full(n: int, value: float) -> Column:
+        return array("d", [value]) * n
+
+    def _sum(column: Column) -> float:
+        return math.fsum(column)
+
+    def _apply(fn: Callable[..., Any], *args: Column | float) -> Column:
+        # at least one of args must be a column
+        return array(
+            "d", map(fn, *(a if isinstance(a, array) else repeat(a) for a in args))
+        )
+
+
+class VectorArray:
+    """N points (or vectors) with the same operations as `Vector`,
+    each of which runs over all the points in one call.
+    Methods returning a scalar per point for `Vector` return a column here.
+    Keep VectorArray on the left side of binary operators with a Vector."""
+
+    __slots__ = ("x", "y", "z")
+
+    def __init__(
+        self,
+        x: Iterable[float] = (),
+        y: Iterable[float] | None = None,
+        z: Iterable[float] | None = None,
+    ):
+        self.x = _column(x)
+        self.y = _column(y) if y is not None else _full(len(self.x), 0.0)
+        self.z = _column(z) if z is not None else _full(len(self.x), 0.0)
+        if not len(self.x) == len(self.y) == len(self.z):
+            raise ValueError("Columns must have the same length")
+
+    @classmethod
+    def from_vectors(cls, vectors: Iterable[Vector]):
+        """Create a VectorArray from Vectors, Point3Ds or Vector3Ds."""
+        if not isinstance(vectors, (list, tuple)):
+            vectors = list(vectors)
+        return cls(
+            [v.x for v in vectors], [v.y for v in vectors], [v.z for v in vectors]
+        )
+
+    @classmethod
+    def concat(cls, arrays: Iterable[VectorArray]):
+        """Concatenate VectorArrays into one."""
+        arrays = list(arrays)
+        if np is not None:
+            return cls(
+                np.concatenate([a.x for a in arrays]),
+                np.concatenate([a.y for a in arrays]),
+                np.concatenate([a.z for a in arrays]),
+            )
+        result = cls()
+        for a in arrays:
+            result.x.extend(a.x)
+            result.y.extend(a.y)
+            result.z.extend(a.z)
+        return result
+
+    def to_vectors(self) -> list[Vector]:
+        """Convert to a list of Vectors."""
+        return list(map(_vector, self.x.tolist(), self.y.tolist(), self.z.tolist()))
+
+    def __len__(self):
+        return len(self.x)
+
+    def __iter__(self) -> Iterator[Vector]:
+        return map(_vector, self.x.tolist(), self.y.tolist(), self.z.tolist())
+
+    def __getitem__(self, index: int | slice | Any):
+        """Return a Vector for an integer index, otherwise a VectorArray
+        (slices, and with NumPy also index arrays and boolean masks)."""
+        if isinstance(index, Integral):
+            return _vector(
+                float(self.x[index]), float(self.y[index]), float(self.z[index])
+            )
+        return VectorArray(self.x[index], self.y[index], self.z[index])
+
+    def __repr__(self):
+        return f"VectorArray({len(self)} points)"
+
+    def __add__(self, other: VectorArray | Vector):
+        return VectorArray(
+            _apply(operator.add, self.x, other.x),
+            _apply(operator.add, self.y, other.y),
+            _apply(operator.add, self.z, other.z),
+        )
+
+    def __sub__(self, other: VectorArray | Vector):
+        return VectorArray(
+            _apply(operator.sub, self.x, other.x),
+            _apply(operator.sub, self.y, other.y),
+            _apply(operator.sub, self.z, other.z),
+        )
+
+    def __mul__(self, scalar: float | Column):
+        return VectorArray(
+            _apply(operator.mul, self.x, scalar),
+            _apply(operator.mul, self.y, scalar),
+            _apply(operator.mul, self.z, scalar),
+        )
+
+    def __rmul__(self, scalar: float | Column):
+        return self * scalar
+
+    def __truediv__(self, scalar: float | Column):
+        return VectorArray(
+            _apply(operator.truediv, self.x, scalar),
+            _apply(operator.truediv, self.y, scalar),
+            _apply(operator.truediv, self.z, scalar),
+        )
+
+    def __neg__(self):
+        return self * -1.0
+
+    def norm(self) -> Column:
+        """Length of each vector."""
+        return _apply(lambda x, y, z: (x * x + y * y + z * z) ** 0.5, *self.columns())
+
+    def columns(self) -> tuple[Column, Column, Column]:
+        return self.x, self.y, self.z
+
+    def sum(self) -> Vector:
+        """Sum of all vectors."""
+        return _vector(_sum(self.x), _sum(self.y), _sum(self.z))
+
+    def centroid(self) -> Vector:
+        """Average of all points."""
+        return self.sum() / len(self)
+
+    def distance(self, other: VectorArray | Vector) -> Column:
+        """Distance from each point to `other`."""
+        return (self - other).norm()
+
+    def dot(self, other: VectorArray | Vector) -> Column:
+        """Dot product of each vector with `other`."""
+        return _apply(
+            lambda x1, y1, z1, x2, y2, z2: x1 * x2 + y1 * y2 + z1 * z2,
+            self.x,
+            self.y,
+            self.z,
+            other.x,
+            other.y,
+            other.z,
+        )
+
+    def cross(self, other: VectorArray | Vector):
+        """Cross product of each vector with `other`."""
+        return VectorArray(
+            _apply(
+                lambda y1, z1, y2, z2: y1 * z2 - z1 * y2,
+                self.y,
+                self.z,
+                other.y,
+                other.z,
+            ),
+            _apply(
+                lambda z1, x1, z2, x2: z1 * x2 - x1 * z2,
+                self.z,
+                self.x,
+                other.z,
+                other.x,
+            ),
+            _apply(
+                lambda x1, y1, x2, y2: x1 * y2 - y1 * x2,
+                self.x,
+                self.y,
+                other.x,
+                other.y,
+            ),
+        )
+
+    def normalize(self, size=1.0):
+        """Scale each vector to the given length."""
+        return self * _apply(lambda n: size / n, self.norm())
+
+    def rotate(self, angle: float, origin: Vector | None = None):
+        """Rotate each vector around z-axis by angle (in radians).
+        Same as `Vector.rotate`, the z components are set to 0
+        (or `origin.z` if origin is given)."""
+        cos_a = math.cos(angle)
+        sin_a = math.sin(angle)
+        ox, oy, oz = (
+            (0.0, 0.0, 0.0) if origin is None else (origin.x, origin.y, origin.z)
+        )
+        return VectorArray(
+            _apply(
+                lambda x, y: (x - ox) * cos_a - (y - oy) * sin_a + ox, self.x, self.y
+            ),
+            _apply(
+                lambda x, y: (x - ox) * sin_a + (y - oy) * cos_a + oy, self.x, self.y
+            ),
+            _full(len(self), oz),
+        )
+
+    def rotate_axis(self, axis: Vector, angle: float):
+        """Rotate each vector around axis by angle (in radians)."""
+        axis = axis.normalize()
+        cos_a = math.cos(angle)
+        sin_a = math.sin(angle)
+        k = self.dot(axis)
+        return (
+            self * cos_a
+            + self.cross(axis) * sin_a
+            + VectorArray(
+                _apply(lambda d: d * (axis.x * (1 - cos_a)), k),
+                _apply(lambda d: d * (axis.y * (1 - cos_a)), k),
+                _apply(lambda d: d * (axis.z * (1 - cos_a)), k),
+            )
+        )
+
+    def distance_from_line(self, p1: Vector, p2: Vector) -> Column:
+        """Distance from each point to the line through p1 and p2 on xy plane."""
+        a = p2.y - p1.y
+        b = p1.x - p2.x
+        c = p2.x * p1.y - p2.y * p1.x
+        length = abs(p2 - p1)
+        return _apply(lambda x, y: abs(a * x + b * y + c) / length, self.x, self.y)
+
+    def project_to_plane(self, origin: Vector, normal: Vector):
+        """Project each point onto a plane defined by an origin and a normal vector."""
+        d = self - origin
+        k = d.dot(normal)
+        return VectorArray(
+            _apply(lambda x, k: x - k * normal.x + origin.x, d.x, k),
+            _apply(lambda y, k: y - k * normal.y + origin.y, d.y, k),
+            _apply(lambda z, k: z - k * normal.z + origin.z, d.z, k),
+        )